@@ -1,99 +1,162 @@
-import jwt
 import bcrypt
-from datetime import datetime, timedelta
-from typing import Optional
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Optional, Union
 import os
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+# Prefer python-jose (cryptography backend) for HS256; fall back to PyJWT
+try:
+    from jose import jwt
+    from jose.exceptions import ExpiredSignatureError, JWTError as InvalidTokenError
+    _JWT_BACKEND = "python-jose"
+except ImportError:
+    import jwt
+    from jwt import ExpiredSignatureError, InvalidTokenError
+    _JWT_BACKEND = "pyjwt"
+
 # Secret key for JWT tokens
 SECRET_KEY = os.getenv("SECRET_KEY", "autoflow-fallback-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
+_DEFAULT_EXP_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Resolved once at import; jwt.decode enforces the claims we rely on.
+_JWT_ALGORITHMS = [ALGORITHM]
+if _JWT_BACKEND == "python-jose":
+    _JWT_OPTIONS = {"verify_exp": True, "require_exp": True, "require_sub": True, "require_iat": True}
+else:
+    _JWT_OPTIONS = {"require": ["exp", "sub", "iat"], "verify_exp": True}
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+# Short-lived cache of decoded tokens, keyed by sha256(token) so raw tokens
+# are never held in memory. Entries are also dropped once the token expires.
+TOKEN_CACHE_TTL_SECONDS = 5
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def _get_cached_payload(key: bytes) -> Optional[dict]:
+    now = time.time()
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        cached_at, payload = entry
+        if now - cached_at > TOKEN_CACHE_TTL_SECONDS or payload.get("exp", 0) <= now:
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return payload
+
+def _cache_payload(key: bytes, payload: dict) -> None:
+    with _token_cache_lock:
+        _token_cache[key] = (time.time(), payload)
+        _token_cache.move_to_end(key)
+        if len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+            _token_cache.popitem(last=False)
+
+def _hash_password_sync(password: str) -> bytes:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS))
+
+async def hash_password(password: str) -> bytes:
+    """Hash a password using bcrypt (runs in a worker thread).
+
+    The hash is returned as raw bytes and stored as BSON binary.
+    """
     try:
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        return await asyncio.to_thread(_hash_password_sync, password)
     except Exception as e:
-        print(f"❌ Error hashing password: {str(e)}")
+        logger.error("Error hashing password: %s", e)
         raise
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
+async def verify_password(password: str, hashed_password: Union[str, bytes]) -> bool:
+    """Verify a password against its hash (runs in a worker thread)"""
     try:
-        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        # Older records store the hash as a str; new ones are already bytes
+        if isinstance(hashed_password, str):
+            hashed_password = hashed_password.encode('utf-8')
+        return await asyncio.to_thread(bcrypt.checkpw, password.encode('utf-8'), hashed_password)
     except Exception as e:
-        print(f"❌ Error verifying password: {str(e)}")
+        logger.error("Error verifying password: %s", e)
         return False
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     try:
         to_encode = data.copy()
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = now + _DEFAULT_EXP_SECONDS
         
-        to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+        to_encode.update({"exp": expire, "iat": now})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
     except Exception as e:
-        print(f"❌ Error creating access token: {str(e)}")
+        logger.error("Error creating access token: %s", e)
         raise
 
+def _decode_token(token: str) -> dict:
+    """Decode a JWT token through the short-lived cache; raises on invalid tokens"""
+    cache_key = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = _get_cached_payload(cache_key)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_OPTIONS)
+        _cache_payload(cache_key, payload)
+    return payload
+
 def verify_token(token: str) -> Optional[dict]:
     """Verify and decode a JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.ExpiredSignatureError:
-        print("⚠️ Token has expired")
+        return _decode_token(token)
+    except ExpiredSignatureError:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Token has expired")
         return None
-    except jwt.InvalidTokenError:
-        print("⚠️ Invalid token")
+    except InvalidTokenError as e:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Invalid token: %s", e)
         return None
     except Exception as e:
-        print(f"❌ Error verifying token: {str(e)}")
+        logger.error("Error verifying token: %s", e)
         return None
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Get current user from JWT token"""
+def _user_from_token(token: str) -> str:
+    """Return the user id ("sub") of a token or raise a 401"""
     try:
-        token = credentials.credentials
-        print(f"🔐 Received token: {token[:20]}...")  # Debug log
-        
-        payload = verify_token(token)
-        
-        if payload is None:
-            print("❌ Token verification failed")
-            raise HTTPException(
-                status_code=401, 
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
-        
-        user_id = payload.get("sub")
-        if user_id is None:
-            print("❌ No user ID in token payload")
-            raise HTTPException(
-                status_code=401, 
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"}
-            )
-        
-        print(f"✅ Authenticated user: {user_id}")
-        return user_id
-    except HTTPException:
-        raise
+        # "sub" presence is enforced by _JWT_OPTIONS
+        return _decode_token(token)["sub"]
+    except (ExpiredSignatureError, InvalidTokenError, KeyError) as e:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Rejected token: %s", e)
+        raise HTTPException(
+            status_code=401, 
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
     except Exception as e:
-        print(f"❌ Error getting current user: {str(e)}")
+        logger.error("Error getting current user: %s", e)
         raise HTTPException(
             status_code=401, 
             detail="Authentication error",
             headers={"WWW-Authenticate": "Bearer"}
         )
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Get current user from JWT token"""
+    return _user_from_token(credentials.credentials)
+
+# Shared dependency marker for routes: `current_user_id: str = CurrentUser`
+CurrentUser = Depends(get_current_user, use_cache=True)
@@ -1,24 +1,34 @@
 # backend/app/core/runner.py
 
-import networkx as nx
 import sys
 import os
 import json
+import logging
 import re
-import atexit
 import asyncio
+import hashlib
+import mimetypes
+import threading
 import time
+from collections import ChainMap, OrderedDict
+from functools import lru_cache
 from urllib.parse import urlparse
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 
-from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from abc import ABC, abstractmethod
 
 # Add the backend directory to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # Import models
 from ..models.workflow import Node, Edge, Workflow
@@ -29,10 +39,11 @@ from services.email import run_email_node
 from services.webhook import run_webhook_node
 from services.whatsapp import run_whatsapp_node
 from services.googlesheets import write_to_sheet
-from services.file_upload import upload_to_drive, download_from_drive
+from services.file_upload import upload_to_drive, download_from_drive, get_drive_file_info
 from services.image_generation import run_image_generation_node
 from services.discord import run_discord_node
-from services.report_generator import run_report_generator_node
+from services import report_generator
+from services import document_parser
 from services.social_media import run_social_media_node
 from services.gmail_trigger import format_email_event
 
@@ -63,6 +74,147 @@ from ..database.user_operations import get_user_by_id, update_user_stats
 from ..database.workflow_operations import save_execution_history
 
 
+@dataclass(frozen=True)
+class NodeResult:
+    """A node's output, classified once when it is produced.
+
+    ``kind`` is one of "document", "report", "image", "file", "ai", "email",
+    "webhook" or "text"; ``path`` holds the file path or URL carried by
+    document/report/image/file results. Document results consumed by other
+    nodes carry the parsed JSON in ``data`` so it is read once per run.
+    """
+    kind: str
+    text: str
+    path: str = ""
+    data: Any = field(default=None, compare=False, repr=False)
+
+
+# Services put their status wording at the start of a result, so only this
+# much of a (possibly very long) result is inspected when classifying it
+STATUS_HEAD_CHARS = 256
+
+# Status markers the services start their results with, matched at position 0
+_RESULT_MARKERS = {
+    "Document parsed: ": "document",
+    "Report generated: ": "report",
+    "Image generated: ": "image",
+    "File uploaded: ": "file",
+    "Schedule set: ": "schedule",
+}
+_RESULT_MARKER_RE = re.compile("|".join(map(re.escape, _RESULT_MARKERS)))
+
+
+def classify_result(result: Any) -> Optional[NodeResult]:
+    """Classify a legacy string result; returns None for empty/non-string results."""
+    if not result or not isinstance(result, str):
+        return None
+    
+    match = _RESULT_MARKER_RE.match(result)
+    if match is not None:
+        return NodeResult(_RESULT_MARKERS[match.group()], result, result[match.end():].strip())
+    
+    if ContentProcessor._is_ai_content(result):
+        return NodeResult("ai", result)
+    
+    if result.startswith("Email sent successfully"):
+        return NodeResult("email", result)
+    if result.startswith("Webhook ") and "executed successfully" in result[:STATUS_HEAD_CHARS]:
+        return NodeResult("webhook", result)
+    return NodeResult("text", result)
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when available, falling back to the stdlib parser."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity, which only the stdlib parser accepts
+    return json.loads(data)
+
+
+def _load_json_file(path: str) -> Any:
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+# Recently read parsed documents keyed by (path, mtime), so a document that fans
+# out to several consumers is decoded once. Entries are shared between callers
+# and must not be mutated.
+PARSED_CACHE_MAX_SIZE = 8
+_parsed_cache: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+_parsed_cache_lock = threading.Lock()
+
+
+def _load_parsed_file(path: str) -> Dict[str, Any]:
+    """Parsed document JSON at ``path``, served from the cache while the file is unchanged."""
+    key = (path, os.stat(path).st_mtime_ns)
+    with _parsed_cache_lock:
+        parsed_data = _parsed_cache.get(key)
+        if parsed_data is not None:
+            _parsed_cache.move_to_end(key)
+            return parsed_data
+    
+    parsed_data = _load_json_file(path)
+    with _parsed_cache_lock:
+        _parsed_cache[key] = parsed_data
+        if len(_parsed_cache) > PARSED_CACHE_MAX_SIZE:
+            _parsed_cache.popitem(last=False)
+    return parsed_data
+
+
+def load_parsed_document(result: NodeResult) -> Dict[str, Any]:
+    """Parsed JSON of a document result, reading the file only if it was not preloaded.
+
+    A preloaded document that has a ``content_preview`` does not keep the full
+    ``content``; use load_document_content() when the whole text is needed.
+    The returned dict may be shared with other consumers; do not modify it.
+    """
+    if result.data is not None:
+        return result.data
+    return _load_parsed_file(result.path)
+
+
+def load_document_content(result: NodeResult) -> str:
+    """Full text of a document result, re-reading the file if the preload dropped it."""
+    parsed_data = load_parsed_document(result)
+    if "content" not in parsed_data and "content_preview" in parsed_data:
+        parsed_data = _load_parsed_file(result.path)
+    return parsed_data.get('content', '')
+
+
+def _override(base: Dict[str, Any], **overrides: Any) -> Dict[str, Any]:
+    """Copy of node data with some fields replaced, for services that get their own dict."""
+    data = base.copy()
+    data.update(overrides)
+    return data
+
+
+def _ensure_2d(values: List[Any]) -> List[List[Any]]:
+    """Sheet rows from configured values; a single flat row is wrapped into one."""
+    return [values] if values and isinstance(values[0], str) else values
+
+
+def _preview(text: str, limit: int) -> str:
+    """``text`` cut to ``limit`` characters, marked with a one-character ellipsis when cut."""
+    return text if len(text) <= limit else f"{text[:limit]}…"
+
+
+def document_preview(parsed_data: Dict[str, Any], limit: int) -> Tuple[str, bool]:
+    """The first ``limit`` characters of a parsed document's text, and whether it was cut."""
+    preview = parsed_data.get('content_preview')
+    if preview is None:
+        content = parsed_data.get('content', '')
+        return content[:limit], len(content) > limit
+    return preview[:limit], parsed_data.get('content_length', len(preview)) > limit
+
+
+# Node types that use a parsed document's metadata, sheets or preview. Documents
+# are only preloaded for these; other consumers either ignore the parsed JSON or
+# need the full text, which the preload does not keep.
+PRELOAD_DOCUMENT_CONSUMERS = frozenset({"email", "google_sheets", "report_generator", "social_media"})
+
+
 @dataclass
 class NodeExecutionContext:
     """Context for node execution containing all necessary data."""
@@ -70,6 +222,16 @@ class NodeExecutionContext:
     input_data: Dict[str, Any]
     api_manager: Optional[Any]
     user_id: Optional[str] = None
+    # Classified predecessor results; derived from input_data when not supplied
+    inputs: Optional[Dict[str, NodeResult]] = field(default=None)
+    
+    def __post_init__(self):
+        if self.inputs is None:
+            self.inputs = {}
+            for pred_id, pred_result in (self.input_data or {}).items():
+                result = classify_result(pred_result)
+                if result is not None:
+                    self.inputs[pred_id] = result
 
 
 @dataclass
@@ -80,75 +242,175 @@ class ExecutionResult:
     error_message: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class CompiledPlan:
+    """Execution plan for a workflow graph, reusable across runs of the same shape."""
+    order: Tuple[str, ...]
+    predecessors: Dict[str, Tuple[str, ...]]
+    successors: Dict[str, Tuple[str, ...]]
+    levels: Tuple[Tuple[str, ...], ...]
+
+
+# Compiled plans keyed by graph fingerprint; node data is not part of the key
+PLAN_CACHE_MAX_SIZE = 256
+_plan_cache: "OrderedDict[str, CompiledPlan]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def _plan_fingerprint(nodes: List[Node], edges: List[Edge]) -> str:
+    """Fingerprint of the graph shape (node ids/types and edges)."""
+    shape = [[node.id, node.type] for node in nodes] + [[edge.source, edge.target] for edge in edges]
+    encoded = orjson.dumps(shape) if orjson is not None else json.dumps(shape).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class CycleError(ValueError):
+    """Raised when a workflow graph contains a cycle."""
+
+
+def compile_plan(nodes: List[Node], edges: List[Edge]) -> CompiledPlan:
+    """Topologically sort the workflow graph into execution levels (Kahn's algorithm).
+
+    Raises CycleError if the graph has a cycle and ValueError if an edge
+    references an unknown node.
+    """
+    node_ids = [node.id for node in nodes]
+    predecessors: Dict[str, Dict[str, None]] = {node_id: {} for node_id in node_ids}
+    successors: Dict[str, Dict[str, None]] = {node_id: {} for node_id in node_ids}
+    
+    for edge in edges:
+        if edge.source not in successors or edge.target not in predecessors:
+            raise ValueError(f"Edge {edge.source} -> {edge.target} references an unknown node")
+        # Ordered dicts as sets: duplicate edges collapse, insertion order is kept
+        successors[edge.source][edge.target] = None
+        predecessors[edge.target][edge.source] = None
+    
+    in_degree = {node_id: len(predecessors[node_id]) for node_id in node_ids}
+    ready = [node_id for node_id in node_ids if in_degree[node_id] == 0]
+    levels: List[Tuple[str, ...]] = []
+    
+    if len(ready) == len(node_ids):
+        # No dependencies at all: everything runs in a single level
+        levels.append(tuple(ready))
+    else:
+        while ready:
+            levels.append(tuple(ready))
+            next_ready = []
+            for node_id in ready:
+                for successor in successors[node_id]:
+                    in_degree[successor] -= 1
+                    if in_degree[successor] == 0:
+                        next_ready.append(successor)
+            ready = next_ready
+    
+    order = tuple(node_id for level in levels for node_id in level)
+    if len(order) < len(node_ids):
+        remaining = [node_id for node_id in node_ids if in_degree[node_id] > 0]
+        raise CycleError(f"Cycle detected among nodes: {remaining}")
+    
+    return CompiledPlan(
+        order=order,
+        predecessors={node_id: tuple(preds) for node_id, preds in predecessors.items()},
+        successors={node_id: tuple(succs) for node_id, succs in successors.items()},
+        levels=tuple(levels),
+    )
+
+
+def get_compiled_plan(nodes: List[Node], edges: List[Edge]) -> CompiledPlan:
+    """Return the compiled plan for this graph shape, compiling and caching it on a miss.
+
+    Only acyclic graphs are cached, so a cache hit needs no further validation.
+    Calling this when a workflow is saved validates it and warms the cache for
+    its first run. Raises CycleError / ValueError like compile_plan.
+    """
+    key = _plan_fingerprint(nodes, edges)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+        if plan is not None:
+            _plan_cache.move_to_end(key)
+            return plan
+    
+    plan = compile_plan(nodes, edges)
+    logger.debug("Execution levels: %s", plan.levels)
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+        if len(_plan_cache) > PLAN_CACHE_MAX_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+# Shared by every scheduler in the app. Ticks missed while a run is still going
+# (or while the process was busy) collapse into one run instead of a burst, and a
+# workflow never overlaps with itself.
+SCHEDULER_JOB_DEFAULTS = {
+    "coalesce": True,
+    "max_instances": 1,
+    "misfire_grace_time": 60,
+}
+
+
 class WorkflowScheduler:
     """Handles workflow scheduling operations."""
     
     def __init__(self):
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.start()
-        atexit.register(lambda: self.scheduler.shutdown())
-    
-    def schedule_task(self, cron_expr: str, workflow: Dict[str, Any]) -> None:
-        """Schedule a workflow task with cron expression."""
-        self.scheduler.add_job(
-            lambda: self._run_workflow_sync(workflow),
-            trigger="cron",
-            **self._parse_cron_expr(cron_expr)
-        )
+        # Jobs are coroutines run directly on the app's event loop; see start()
+        self.scheduler = AsyncIOScheduler(job_defaults=SCHEDULER_JOB_DEFAULTS)
+    
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the scheduler on the given (long-lived) event loop."""
+        if not self.scheduler.running:
+            self.scheduler.configure(event_loop=loop)
+            self.scheduler.start()
+    
+    def shutdown(self) -> None:
+        """Stop the scheduler without waiting for running jobs."""
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
     
     def _parse_cron_expr(self, expr: str) -> Dict[str, str]:
         """Parse cron expression into scheduler parameters."""
-        fields = expr.split()
-        if len(fields) != 5:
-            raise ValueError(f"Invalid cron expression: {expr}")
+        try:
+            minute, hour, day, month, day_of_week = expr.split()
+        except ValueError:
+            raise ValueError(f"Invalid cron expression: {expr}") from None
         
         return {
-            "minute": fields[0],
-            "hour": fields[1],
-            "day": fields[2],
-            "month": fields[3],
-            "day_of_week": fields[4],
+            "minute": minute,
+            "hour": hour,
+            "day": day,
+            "month": month,
+            "day_of_week": day_of_week,
         }
-    
-    def _run_workflow_sync(self, workflow: Dict[str, Any]) -> Any:
-        """Synchronous wrapper for workflow execution."""
-        import asyncio
-        return asyncio.run(run_workflow_engine(workflow["nodes"], workflow["edges"]))
 
 
 class ContentProcessor:
     """Handles processing of content between workflow nodes."""
     
     @staticmethod
-    def extract_file_attachments(input_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract file attachments from input data."""
+    def extract_file_attachments(inputs: Dict[str, NodeResult]) -> List[Dict[str, Any]]:
+        """Extract file attachments from classified input results."""
         attachments = []
         
-        for pred_id, pred_result in input_data.items():
-            if not pred_result or not isinstance(pred_result, str):
-                continue
-                
+        for pred_id, result in inputs.items():
             # Handle different types of file results
-            if "Document parsed:" in pred_result:
-                json_path = pred_result.split("Document parsed: ")[-1]
-                if os.path.exists(json_path):
+            if result.kind == "document":
+                if os.path.exists(result.path):
                     attachments.append({
-                        "path": json_path,
+                        "path": result.path,
                         "name": "parsed_document.json",
                         "type": "file"
                     })
             
-            elif "Report generated:" in pred_result:
-                report_path = pred_result.split("Report generated: ")[-1]
-                if os.path.exists(report_path):
+            elif result.kind == "report":
+                if os.path.exists(result.path):
                     attachments.append({
-                        "path": report_path,
-                        "name": os.path.basename(report_path),
+                        "path": result.path,
+                        "name": os.path.basename(result.path),
                         "type": "file"
                     })
             
-            elif "Image generated:" in pred_result:
-                image_path = ContentProcessor._find_image_path(pred_result)
+            elif result.kind == "image":
+                image_path = ContentProcessor._find_image_path(result.path)
                 if image_path:
                     attachments.append({
                         "path": image_path,
@@ -156,10 +418,9 @@ class ContentProcessor:
                         "type": "file"
                     })
             
-            elif "File uploaded:" in pred_result:
-                file_url = pred_result.split("File uploaded: ")[-1]
+            elif result.kind == "file":
                 attachments.append({
-                    "url": file_url,
+                    "url": result.path,
                     "name": "uploaded_file",
                     "type": "url"
                 })
@@ -167,78 +428,72 @@ class ContentProcessor:
         return attachments
     
     @staticmethod
-    def _find_image_path(pred_result: str) -> Optional[str]:
-        """Find and validate image path from generation result."""
-        image_path = pred_result.split("Image generated: ")[-1].strip()
-        
-        image_path = os.path.normpath(image_path)
-        if os.path.exists(image_path):
-            return os.path.abspath(image_path)
-        
-        alternative_paths = [
-        os.path.abspath(image_path),
-        os.path.join(os.getcwd(), image_path),
-        os.path.join(os.getcwd(), os.path.basename(image_path)),
-        ]
-
-        for alt_path in alternative_paths:
-            normalized_path = os.path.normpath(alt_path)
-            if os.path.exists(normalized_path):
-                return normalized_path
-        
-            print(f"Image path not found: {image_path}")
-            print(f"Tried paths: {alternative_paths}")
-            return None
-        
+    def _find_image_path(image_path: str) -> Optional[str]:
+        """Find and validate an image path from a generation result."""
+        # abspath() already resolves relative paths against the working directory,
+        # so the only other place worth a stat() is the bare file name there
+        candidates = list(dict.fromkeys((
+            os.path.abspath(image_path),
+            os.path.join(os.getcwd(), os.path.basename(image_path)),
+        )))
+        
+        for candidate in candidates:
+            if os.path.exists(candidate):
+                return candidate
+        
+        logger.warning("Image path not found: %s", image_path)
+        logger.warning("Tried paths: %s", candidates)
+        return None
+    
     @staticmethod
-    def extract_ai_content(input_data: Dict[str, Any]) -> List[Dict[str, str]]:
-        """Extract AI-generated content from input data."""
+    def extract_ai_content(inputs: Dict[str, NodeResult]) -> List[Dict[str, str]]:
+        """Extract AI-generated content from classified input results."""
         ai_content = []
         
-        for pred_id, pred_result in input_data.items():
-            if not ContentProcessor._is_ai_content(pred_result):
+        for pred_id, result in inputs.items():
+            if result.kind != "ai":
                 continue
             
             ai_model = ContentProcessor._determine_ai_model(pred_id)
             ai_content.append({
                 "model": ai_model,
-                "content": pred_result,
+                "content": result.text,
                 "source_id": pred_id
             })
         
         return ai_content
     
+    # Status/error wording that marks a result as not being AI-generated text
+    _NON_AI_RE = re.compile(
+        r"failed|error|not implemented|sent successfully|uploaded|generated:|deleted|saved|webhook|document parsed:",
+        re.IGNORECASE,
+    )
+    
     @staticmethod
     def _is_ai_content(pred_result: Any) -> bool:
         """Check if result is AI-generated content."""
         if not isinstance(pred_result, str) or len(pred_result.strip()) <= 10:
             return False
         
-        excluded_terms = [
-            "failed", "error", "not implemented", "sent successfully", 
-            "uploaded", "generated:", "deleted", "saved", "webhook", 
-            "document parsed:"
-        ]
-        
-        return not any(term in pred_result.lower() for term in excluded_terms)
+        return ContentProcessor._NON_AI_RE.search(pred_result, 0, STATUS_HEAD_CHARS) is None
+    
+    # Model label for each tag a predecessor ID may contain; the first tag in the ID wins
+    _AI_MODEL_LABELS = {
+        "gpt": "GPT",
+        "claude": "Claude",
+        "gemini": "Gemini",
+        "llama": "Llama",
+        "mistral": "Mistral",
+    }
+    _AI_MODEL_RE = re.compile("|".join(_AI_MODEL_LABELS), re.IGNORECASE)
     
     @staticmethod
     def _determine_ai_model(pred_id: str) -> str:
         """Determine AI model type from predecessor ID."""
-        pred_id_lower = str(pred_id).lower()
-        
-        if "gpt" in pred_id_lower:
-            return "GPT"
-        elif "claude" in pred_id_lower:
-            return "Claude"
-        elif "gemini" in pred_id_lower:
-            return "Gemini"
-        elif "llama" in pred_id_lower:
-            return "Llama"
-        elif "mistral" in pred_id_lower:
-            return "Mistral"
-        
-        return "AI Assistant"
+        match = ContentProcessor._AI_MODEL_RE.search(str(pred_id))
+        if match is None:
+            return "AI Assistant"
+        return ContentProcessor._AI_MODEL_LABELS[match.group().lower()]
 
 
 class BaseNodeExecutor(ABC):
@@ -263,7 +518,7 @@ class AINodeExecutor(BaseNodeExecutor):
     
     async def execute(self, context: NodeExecutionContext) -> ExecutionResult:
         try:
-            user_ai_key = await self._setup_ai_api_keys(context)
+            user_ai_key = await self._get_ai_api_key(context)
 
             if _require_user_owned_keys() and not user_ai_key:
                 return ExecutionResult(
@@ -272,37 +527,34 @@ class AINodeExecutor(BaseNodeExecutor):
                     "Missing user AI key. Add your Groq/OpenAI key in Settings > API Keys.",
                 )
             
-            prompt = self._build_prompt(context)
+            prompt = await self._build_prompt(context)
             if not prompt:
                 return ExecutionResult(False, None, f"No prompt provided for {context.node.type} node")
             
             model = context.node.data.get("model", "llama-3.3-70b-versatile")
-            result = await run_gpt_node(prompt, model)
+            result = await run_gpt_node(prompt, model, api_key=user_ai_key)
             
             return ExecutionResult(True, result)
             
         except Exception as e:
             return ExecutionResult(False, None, f"Error executing {context.node.type} node: {str(e)}")
     
-    async def _setup_ai_api_keys(self, context: NodeExecutionContext) -> Optional[str]:
-        """Setup API keys for AI models."""
+    async def _get_ai_api_key(self, context: NodeExecutionContext) -> Optional[str]:
+        """Get the user's AI key; passed per call so concurrent runs never share it."""
         if not context.api_manager:
             return None
         
-        api_key = await context.api_manager.get_groq_key()
-        if api_key:
-            os.environ["GROQ_API_KEY"] = api_key
-
-        return api_key
+        return await context.api_manager.get_groq_key()
     
-    def _build_prompt(self, context: NodeExecutionContext) -> str:
+    async def _build_prompt(self, context: NodeExecutionContext) -> str:
         """Build prompt from node data and input context."""
-        prompt = context.node.data.get("prompt") or context.node.data.get("label", "")
+        data = context.node.data
+        prompt = data.get("prompt") or data.get("label", "")
         
         # Check for parsed document content
-        for pred_id, pred_result in context.input_data.items():
-            if "Document parsed:" in str(pred_result):
-                enhanced_prompt = self._enhance_prompt_with_document(prompt, pred_result)
+        for pred_id, result in context.inputs.items():
+            if result.kind == "document":
+                enhanced_prompt = await self._enhance_prompt_with_document(prompt, result)
                 if enhanced_prompt:
                     return enhanced_prompt
 
@@ -312,7 +564,7 @@ class AINodeExecutor(BaseNodeExecutor):
         for pred_id, pred_result in context.input_data.items():
             if not pred_result:
                 continue
-            pred_text = str(pred_result).strip()
+            pred_text = (pred_result if isinstance(pred_result, str) else str(pred_result)).strip()
             if pred_text:
                 context_parts.append(f"[{pred_id}] {pred_text}")
 
@@ -325,18 +577,15 @@ class AINodeExecutor(BaseNodeExecutor):
         
         return prompt
     
-    def _enhance_prompt_with_document(self, prompt: str, pred_result: str) -> Optional[str]:
+    async def _enhance_prompt_with_document(self, prompt: str, result: NodeResult) -> Optional[str]:
         """Enhance prompt with document content."""
         try:
-            json_path = str(pred_result).split("Document parsed: ")[-1]
-            with open(json_path, 'r', encoding='utf-8') as f:
-                parsed_data = json.load(f)
-            
-            document_content = parsed_data.get('content', '')
+            # The full text may have to be re-read from disk; keep that off the loop
+            document_content = await asyncio.to_thread(load_document_content, result)
             if document_content:
                 return f"{prompt}\n\nDocument content to analyze:\n{document_content}"
         except Exception as e:
-            print(f"Error reading parsed document for AI: {str(e)}")
+            logger.warning("Error reading parsed document for AI: %s", e)
         
         return None
 
@@ -346,13 +595,12 @@ class EmailNodeExecutor(BaseNodeExecutor):
     
     async def execute(self, context: NodeExecutionContext) -> ExecutionResult:
         try:
-            email_data = self._build_email_data(context)
-            user_google_token_json = None
-            if context.api_manager:
-                user_google_token_json = (
-                    await context.api_manager.get_google_token_json()
-                    or await context.api_manager.get_gmail_token_json()
-                )
+            # Attachment stats and parsed-document reads run in a worker thread,
+            # overlapping with the credential lookup
+            email_data, user_google_token_json = await asyncio.gather(
+                asyncio.to_thread(self._build_email_data, context),
+                self._get_google_token_json(context),
+            )
 
             if _require_user_owned_keys() and not user_google_token_json:
                 return ExecutionResult(
@@ -370,60 +618,68 @@ class EmailNodeExecutor(BaseNodeExecutor):
         except Exception as e:
             return ExecutionResult(False, None, f"Error executing email node: {str(e)}")
     
+    async def _get_google_token_json(self, context: NodeExecutionContext) -> Optional[str]:
+        """Get the user's Google token, falling back to the Gmail token."""
+        if not context.api_manager:
+            return None
+        
+        return (
+            await context.api_manager.get_google_token_json()
+            or await context.api_manager.get_gmail_token_json()
+        )
+    
     def _build_email_data(self, context: NodeExecutionContext) -> Dict[str, Any]:
         """Build email data with attachments and enhanced content."""
-        email_body = context.node.data.get("body", "")
-        attachments = ContentProcessor.extract_file_attachments(context.input_data)
+        body_parts = [context.node.data.get("body", "")]
+        attachments = ContentProcessor.extract_file_attachments(context.inputs)
         
         # Add AI content to email body
-        ai_content = ContentProcessor.extract_ai_content(context.input_data)
+        ai_content = ContentProcessor.extract_ai_content(context.inputs)
         if ai_content:
-            email_body += "\n\n--- AI Generated Content ---\n"
+            body_parts.append("\n\n--- AI Generated Content ---\n")
             for ai_item in ai_content:
-                email_body += f"\n**{ai_item['model']} Response:**\n"
-                email_body += f"{ai_item['content']}\n"
-                email_body += f"\n{'-' * 50}\n"
+                body_parts.extend((
+                    f"\n**{ai_item['model']} Response:**\n",
+                    f"{ai_item['content']}\n",
+                    f"\n{'-' * 50}\n",
+                ))
             
-            email_body += f"\n\nThis email contains AI-generated content from your AutoFlow workflow.\n"
-            email_body += f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            body_parts.append("\n\nThis email contains AI-generated content from your AutoFlow workflow.\n")
+            body_parts.append(f"Generated on: {time.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # Add document content
-        email_body = self._add_document_content(email_body, context.input_data)
+        self._add_document_content(body_parts, context.inputs)
         
-        return {
-            **context.node.data,
-            "body": email_body,
-            "attachments": attachments
-        }
+        return _override(context.node.data, body="".join(body_parts), attachments=attachments)
     
-    def _add_document_content(self, email_body: str, input_data: Dict[str, Any]) -> str:
-        """Add parsed document content to email body."""
-        for pred_id, pred_result in input_data.items():
-            if "Document parsed:" not in str(pred_result):
+    def _add_document_content(self, body_parts: List[str], inputs: Dict[str, NodeResult]) -> None:
+        """Append parsed document content to the email body parts."""
+        for pred_id, result in inputs.items():
+            if result.kind != "document":
                 continue
             
             try:
-                json_path = str(pred_result).split("Document parsed: ")[-1]
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    parsed_data = json.load(f)
+                parsed_data = load_parsed_document(result)
                 
-                email_body += f"\n\n--- Parsed Document Content ---\n"
-                email_body += f"Document: {parsed_data.get('metadata', {}).get('file_name', 'Unknown')}\n"
-                email_body += f"Type: {parsed_data.get('type', 'Unknown').upper()}\n"
-                email_body += f"Pages: {parsed_data.get('total_pages', 'Unknown')}\n"
+                body_parts.append("\n\n--- Parsed Document Content ---\n")
+                body_parts.append(f"Document: {parsed_data.get('metadata', {}).get('file_name', 'Unknown')}\n")
+                body_parts.append(f"Type: {parsed_data.get('type', 'Unknown').upper()}\n")
+                body_parts.append(f"Pages: {parsed_data.get('total_pages', 'Unknown')}\n")
                 
-                content = parsed_data.get('content', '')
+                content, truncated = document_preview(parsed_data, 5000)
                 if content.strip():
-                    if len(content) > 5000:
-                        content = content[:5000] + "\n\n... (content truncated for email)"
-                    email_body += f"**Document Content:**\n{content}"
+                    body_parts.extend(("**Document Content:**\n", content))
+                    if truncated:
+                        body_parts.append("\n\n... (content truncated for email)")
                 else:
-                    email_body += "**Note:** No text content could be extracted from this document."
+                    body_parts.append("**Note:** No text content could be extracted from this document.")
                 
             except Exception as e:
-                email_body += f"\n\nError reading parsed document: {str(e)}"
-        
-        return email_body
+                body_parts.append(f"\n\nError reading parsed document: {str(e)}")
+
+
+# Discord rejects messages with more embeds than this
+DISCORD_MAX_EMBEDS = 10
 
 
 class DiscordNodeExecutor(BaseNodeExecutor):
@@ -439,15 +695,15 @@ class DiscordNodeExecutor(BaseNodeExecutor):
     
     async def _build_discord_data(self, context: NodeExecutionContext) -> Dict[str, Any]:
         """Build Discord message data with embeds."""
-        message = context.node.data.get("message", "")
-        username = context.node.data.get("username", "AutoFlow Bot")
-        webhook_url = context.node.data.get("webhook_url", "")
+        data = context.node.data
+        message = data.get("message", "")
+        username = data.get("username", "AutoFlow Bot")
+        webhook_url = data.get("webhook_url", "")
         
-        # Get Discord webhook from user settings
+        # Get Discord webhook from user settings; it only goes into the payload built
+        # below, never back into the (shared, possibly cached) node data
         if context.api_manager:
             webhook_url = await context.api_manager.get_discord_webhook()
-            if webhook_url:
-                context.node.data["webhook_url"] = webhook_url
         
         if not webhook_url:
             raise ValueError("Discord webhook URL is required")
@@ -455,87 +711,126 @@ class DiscordNodeExecutor(BaseNodeExecutor):
         # Build embeds from connected content
         embeds = self._build_discord_embeds(context)
         
-        return {
-            **context.node.data,
-            "message": message,
-            "embeds": embeds,
-            "username": username,
-            "webhook_url": webhook_url
-        }
+        return _override(data, message=message, embeds=embeds, username=username, webhook_url=webhook_url)
     
     def _build_discord_embeds(self, context: NodeExecutionContext) -> List[Dict[str, Any]]:
         """Build Discord embeds from input data."""
         embeds = []
         
         # Add main message embed if provided
-        if context.node.data.get("message"):
+        message = context.node.data.get("message")
+        if message:
             main_embed = {
                 "title": "AutoFlow Workflow Results",
-                "description": context.node.data.get("message"),
+                "description": message,
                 "color": 5814783,
                 "footer": {"text": "Sent via AutoFlow"}
             }
             embeds.append(main_embed)
         
-        # Process input data for additional embeds
-        for pred_id, pred_result in context.input_data.items():
-            if not pred_result or not isinstance(pred_result, str):
-                continue
-                
-            embed = self._create_embed_from_result(pred_id, pred_result)
+        # Process input data for additional embeds, stopping at the Discord limit
+        for pred_id, result in context.inputs.items():
+            if len(embeds) >= DISCORD_MAX_EMBEDS:
+                break
+            builder = self._EMBED_BUILDERS.get(result.kind, self._output_embed)
+            embed = builder(pred_id, result)
             if embed:
                 embeds.append(embed)
         
-        return embeds[:10]  # Discord limit
+        return embeds
     
-    def _create_embed_from_result(self, pred_id: str, pred_result: str) -> Optional[Dict[str, Any]]:
-        """Create Discord embed from node result."""
-        if "Report generated:" in pred_result:
-            report_path = pred_result.split("Report generated: ")[-1]
-            return {
-                "title": "Report Generated",
-                "description": f"Report created: **{os.path.basename(report_path)}**",
-                "color": 3066993
-            }
-        elif "Document parsed:" in pred_result:
-            parsed_path = pred_result.split("Document parsed: ")[-1]
-            return {
-                "title": "Document Processed",
-                "description": (
-                    "Document has been parsed and analyzed.\n"
-                    f"Output file: **{os.path.basename(parsed_path)}**"
-                ),
-                "color": 3447003
-            }
-        elif "Image generated:" in pred_result:
-            image_path = pred_result.split("Image generated: ")[-1]
-            return {
-                "title": "Generated Image",
-                "description": f"Image created: **{os.path.basename(image_path)}**",
-                "color": 10181046
-            }
-        elif "File uploaded:" in pred_result:
-            file_url = pred_result.split("File uploaded: ")[-1].strip()
-            return {
-                "title": "File Uploaded",
-                "description": f"Uploaded file is available [here]({file_url})",
-                "color": 5763719
-            }
-        elif ContentProcessor._is_ai_content(pred_result):
-            ai_model = ContentProcessor._determine_ai_model(pred_id)
-            return {
-                "title": f"{ai_model} Response",
-                "description": pred_result[:1500] + "..." if len(pred_result) > 1500 else pred_result,
-                "color": 5814783
-            }
-        elif pred_result.strip():
-            return {
-                "title": f"Node Output ({pred_id})",
-                "description": pred_result[:1500] + "..." if len(pred_result) > 1500 else pred_result,
-                "color": 10070709
-            }
-        
-        return None
+    @staticmethod
+    def _truncate(text: str) -> str:
+        return _preview(text, 1500)
+    
+    @staticmethod
+    def _report_embed(pred_id: str, result: NodeResult) -> Dict[str, Any]:
+        return {
+            "title": "Report Generated",
+            "description": f"Report created: **{os.path.basename(result.path)}**",
+            "color": 3066993
+        }
+    
+    @staticmethod
+    def _document_embed(pred_id: str, result: NodeResult) -> Dict[str, Any]:
+        return {
+            "title": "Document Processed",
+            "description": (
+                "Document has been parsed and analyzed.\n"
+                f"Output file: **{os.path.basename(result.path)}**"
+            ),
+            "color": 3447003
+        }
+    
+    @staticmethod
+    def _image_embed(pred_id: str, result: NodeResult) -> Dict[str, Any]:
+        return {
+            "title": "Generated Image",
+            "description": f"Image created: **{os.path.basename(result.path)}**",
+            "color": 10181046
+        }
+    
+    @staticmethod
+    def _file_embed(pred_id: str, result: NodeResult) -> Dict[str, Any]:
+        return {
+            "title": "File Uploaded",
+            "description": f"Uploaded file is available [here]({result.path})",
+            "color": 5763719
+        }
+    
+    @staticmethod
+    def _ai_embed(pred_id: str, result: NodeResult) -> Dict[str, Any]:
+        ai_model = ContentProcessor._determine_ai_model(pred_id)
+        return {
+            "title": f"{ai_model} Response",
+            "description": DiscordNodeExecutor._truncate(result.text),
+            "color": 5814783
+        }
+    
+    @staticmethod
+    def _output_embed(pred_id: str, result: NodeResult) -> Optional[Dict[str, Any]]:
+        if not result.text.strip():
+            return None
+        return {
+            "title": f"Node Output ({pred_id})",
+            "description": DiscordNodeExecutor._truncate(result.text),
+            "color": 10070709
+        }
+    
+    # Embed builder per result kind; other kinds fall back to a generic output embed
+    _EMBED_BUILDERS = {
+        "report": _report_embed.__func__,
+        "document": _document_embed.__func__,
+        "image": _image_embed.__func__,
+        "file": _file_embed.__func__,
+        "ai": _ai_embed.__func__,
+    }
+
+
+# MIME types of the files workflows produce most; the platform mimetypes
+# tables are only consulted for other extensions
+_FAST_MIME = {
+    '.json': 'application/json',
+    '.pdf': 'application/pdf',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.txt': 'text/plain',
+    '.html': 'text/html',
+    '.csv': 'text/csv',
+    '.md': 'text/markdown',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+@lru_cache(maxsize=1024)
+def _guess_mime(ext: str) -> str:
+    """MIME type for a lowercased file extension, cached since uploads repeat a few extensions."""
+    mime_type = _FAST_MIME.get(ext)
+    if mime_type is None:
+        mime_type, _ = mimetypes.guess_type(f"file{ext}")
+    return mime_type or 'application/octet-stream'
 
 
 class FileUploadNodeExecutor(BaseNodeExecutor):
@@ -543,12 +838,13 @@ class FileUploadNodeExecutor(BaseNodeExecutor):
     
     async def execute(self, context: NodeExecutionContext) -> ExecutionResult:
         try:
-            file_path = self._determine_file_path(context)
-            if not file_path or not os.path.exists(file_path):
+            file_path, exists = self._determine_file_path(context)
+            if not exists:
                 return ExecutionResult(False, None, f"File not found at path: {file_path}")
             
-            file_name = context.node.data.get("name") or os.path.basename(file_path)
-            mime_type = self._get_mime_type(file_path, context.node.data.get("mime_type"))
+            data = context.node.data
+            file_name = data.get("name") or os.path.basename(file_path)
+            mime_type = self._get_mime_type(file_path, data.get("mime_type"))
 
             user_google_token_json = None
             if context.api_manager:
@@ -576,35 +872,22 @@ class FileUploadNodeExecutor(BaseNodeExecutor):
         except Exception as e:
             return ExecutionResult(False, None, f"File upload failed: {str(e)}")
     
-    def _determine_file_path(self, context: NodeExecutionContext) -> str:
-        """Determine file path from node data or connected nodes."""
-        file_path = context.node.data.get("path", "")
-        
+    def _determine_file_path(self, context: NodeExecutionContext) -> Tuple[str, bool]:
+        """Determine file path from connected nodes or node data, and whether it exists."""
         # Check for files from connected nodes
-        for pred_id, pred_result in context.input_data.items():
-            if "Image generated:" in str(pred_result):
-                image_path = str(pred_result).split("Image generated: ")[-1]
-                if os.path.exists(image_path):
-                    return image_path
-            elif "Report generated:" in str(pred_result):
-                report_path = str(pred_result).split("Report generated: ")[-1]
-                if os.path.exists(report_path):
-                    return report_path
-            elif "Document parsed:" in str(pred_result):
-                json_path = str(pred_result).split("Document parsed: ")[-1]
-                if os.path.exists(json_path):
-                    return json_path
+        for pred_id, result in context.inputs.items():
+            if result.kind in ("image", "report", "document") and os.path.exists(result.path):
+                return result.path, True
         
-        return file_path
+        file_path = context.node.data.get("path", "")
+        return file_path, bool(file_path) and os.path.exists(file_path)
     
     def _get_mime_type(self, file_path: str, provided_mime_type: str = None) -> str:
         """Get MIME type for file."""
         if provided_mime_type:
             return provided_mime_type
         
-        import mimetypes
-        mime_type, _ = mimetypes.guess_type(file_path)
-        return mime_type or 'application/octet-stream'
+        return _guess_mime(os.path.splitext(file_path)[1].lower())
 
 
 class ImageGenerationNodeExecutor(BaseNodeExecutor):
@@ -616,10 +899,10 @@ class ImageGenerationNodeExecutor(BaseNodeExecutor):
             if not prompt:
                 return ExecutionResult(False, None, "Image prompt is required")
             
-            await self._setup_image_api_keys(context)
+            api_key = await self._get_image_api_key(context)
             
-            updated_data = {**context.node.data, "prompt": prompt}
-            result = await run_image_generation_node(updated_data)
+            updated_data = ChainMap({"prompt": prompt}, context.node.data)
+            result = await run_image_generation_node(updated_data, api_key=api_key)
             
             return ExecutionResult(True, result)
             
@@ -632,26 +915,27 @@ class ImageGenerationNodeExecutor(BaseNodeExecutor):
         
         # If no prompt, check AI-generated content
         if not prompt:
-            for pred_id, pred_result in context.input_data.items():
-                if ContentProcessor._is_ai_content(pred_result):
-                    return pred_result.strip()[:500]
+            for pred_id, result in context.inputs.items():
+                if result.kind == "ai":
+                    return result.text.strip()[:500]
         
         return prompt
     
-    async def _setup_image_api_keys(self, context: NodeExecutionContext) -> None:
-        """Setup API keys for image generation."""
+    # API manager getter for each image provider's key
+    _PROVIDER_KEY_GETTERS = {
+        "openai": "get_openai_key",
+        "stability": "get_stability_key",
+    }
+    
+    async def _get_image_api_key(self, context: NodeExecutionContext) -> Optional[str]:
+        """Get the user's key for the configured image provider, if any."""
         if not context.api_manager:
-            return
+            return None
         
-        provider = context.node.data.get("provider", "openai")
-        if provider == "openai":
-            api_key = await context.api_manager.get_openai_key()
-            if api_key:
-                os.environ["OPENAI_API_KEY"] = api_key
-        elif provider == "stability":
-            api_key = await context.api_manager.get_stability_key()
-            if api_key:
-                os.environ["STABILITY_API_KEY"] = api_key
+        getter = self._PROVIDER_KEY_GETTERS.get(context.node.data.get("provider", "openai"))
+        if getter is None:
+            return None
+        return await getattr(context.api_manager, getter)()
 
 
 class NodeExecutorFactory:
@@ -678,49 +962,49 @@ class NodeExecutorFactory:
         return None
 
 
+# Upper bound on workflow runs executing at once in this process, so a burst of
+# scheduled ticks or webhook calls does not stampede the downstream APIs
+MAX_CONCURRENT_WORKFLOWS = int(os.getenv("MAX_CONCURRENT_WORKFLOWS", "8"))
+
+
 class WorkflowEngine:
     """Main workflow execution engine."""
     
     def __init__(self):
         self.scheduler = WorkflowScheduler()
+        self._run_slots = asyncio.Semaphore(MAX_CONCURRENT_WORKFLOWS)
     
     async def run_workflow(self, nodes: List[Node], edges: List[Edge], user_id: Optional[str] = None) -> Dict[str, Any]:
         """Run a complete workflow."""
         try:
-            # Build execution graph
-            graph = self._build_graph(nodes, edges)
+            # Get (cached) execution plan
+            plan = self._get_plan(nodes, edges)
+            if plan is None:
+                return {"error": "Cycle detected in workflow"}
             
             # Handle webhook auto-registration
             self._register_webhook_workflows(nodes, edges)
             
-            # Get execution order
-            execution_order = self._get_execution_order(graph)
-            if not execution_order:
-                return {"error": "Cycle detected in workflow"}
-            
             # Setup API manager
             api_manager = await get_user_api_manager(user_id) if user_id else None
             
-            # Execute nodes
-            results = await self._execute_nodes(graph, execution_order, api_manager, user_id)
+            # Execute nodes; runs beyond the concurrency limit wait for a slot
+            node_map = {node.id: node for node in nodes}
+            async with self._run_slots:
+                results = await self._execute_nodes(plan, node_map, api_manager, user_id)
             
             return results
             
         except Exception as e:
             return {"error": f"Workflow execution failed: {str(e)}"}
     
-    def _build_graph(self, nodes: List[Node], edges: List[Edge]) -> nx.DiGraph:
-        """Build NetworkX graph from nodes and edges."""
-        graph = nx.DiGraph()
-        
-        for node in nodes:
-            graph.add_node(node.id, data=node)
-        
-        for edge in edges:
-            graph.add_edge(edge.source, edge.target)
-            print(f"Added edge: {edge.source} -> {edge.target}")
-        
-        return graph
+    def _get_plan(self, nodes: List[Node], edges: List[Edge]) -> Optional[CompiledPlan]:
+        """Return the (cached) plan for this graph, or None if it has a cycle."""
+        try:
+            return get_compiled_plan(nodes, edges)
+        except CycleError as e:
+            logger.warning("%s", e)
+            return None
     
     def _register_webhook_workflows(self, nodes: List[Node], edges: List[Edge]) -> None:
         """Register webhook workflows for auto-triggering."""
@@ -730,64 +1014,92 @@ class WorkflowEngine:
         if webhook_nodes:
             for webhook_node in webhook_nodes:
                 workflow_id = webhook_node.id
-                workflow = Workflow(nodes=nodes, edges=edges)
-                stored_workflows[workflow_id] = workflow
-                print(f"Auto-registered webhook workflow: {workflow_id}")
-    
-    def _get_execution_order(self, graph: nx.DiGraph) -> Optional[List[str]]:
-        """Get topological execution order."""
-        try:
-            execution_order = list(nx.topological_sort(graph))
-            print(f"Execution order: {execution_order}")
-            
-            for node_id in execution_order:
-                node_type = graph.nodes[node_id]["data"].type
-                print(f"Node {node_id} ({node_type}) will execute")
-            
-            return execution_order
-            
-        except nx.NetworkXUnfeasible:
-            print("Cycle detected - printing graph structure:")
-            print(f"Nodes: {list(graph.nodes())}")
-            print(f"Edges: {list(graph.edges())}")
-            return None
+                existing = stored_workflows.get(workflow_id)
+                # Webhook-triggered runs re-run the stored workflow itself; nothing to update
+                if existing is not None and existing.nodes is nodes and existing.edges is edges:
+                    continue
+                # Nodes and edges are already validated models, so skip re-validation
+                stored_workflows[workflow_id] = Workflow.model_construct(nodes=nodes, edges=edges)
+                logger.info("Auto-registered webhook workflow: %s", workflow_id)
     
-    async def _execute_nodes(self, graph: nx.DiGraph, execution_order: List[str], 
+    async def _execute_nodes(self, plan: CompiledPlan, node_map: Dict[str, Node],
                            api_manager: Any, user_id: Optional[str]) -> Dict[str, Any]:
-        """Execute nodes in topological order."""
+        """Execute the plan level by level; independent nodes of a level run concurrently.
+
+        A node is scheduled exactly once, after every predecessor has produced its result.
+        """
         results = {}
+        classified: Dict[str, NodeResult] = {}
         
-        for node_id in execution_order:
-            node: Node = graph.nodes[node_id]["data"]
-            input_data = {
-                pred: results.get(pred)
-                for pred in graph.predecessors(node_id)
-            }
-            
-            print(f"Executing node {node_id} ({node.type})")
-            print(f"Input data for {node_id}: {input_data}")
+        for level in plan.levels:
+            outputs = await asyncio.gather(
+                *(self._execute_plan_node(plan, node_map[node_id], results, classified, api_manager, user_id)
+                  for node_id in level),
+                return_exceptions=True,
+            )
             
-            # Execute node
-            context = NodeExecutionContext(node, input_data, api_manager, user_id)
-            result = await self._execute_single_node(context)
+            documents = []
+            for node_id, result in zip(level, outputs):
+                if isinstance(result, Exception):
+                    result = f"Error executing node {node_id}: {str(result)}"
+                results[node_id] = result
+                node_result = classify_result(result)
+                if node_result is not None:
+                    classified[node_id] = node_result
+                    if node_result.kind == "document" and any(
+                            node_map[succ].type in PRELOAD_DOCUMENT_CONSUMERS
+                            for succ in plan.successors[node_id]):
+                        documents.append(node_id)
+                logger.debug("Node %s result: %s", node_id, result)
             
-            results[node_id] = result
-            print(f"Node {node_id} result: {result}")
+            if documents:
+                loaded = await asyncio.gather(*(self._preload_document(classified[node_id]) for node_id in documents))
+                classified.update(zip(documents, loaded))
         
         return results
     
+    async def _execute_plan_node(self, plan: CompiledPlan, node: Node, results: Dict[str, Any],
+                                 classified: Dict[str, NodeResult], api_manager: Any,
+                                 user_id: Optional[str]) -> Any:
+        """Execute one node with its predecessors' results as input."""
+        predecessors = plan.predecessors[node.id]
+        input_data = {pred: results.get(pred) for pred in predecessors}
+        inputs = {pred: classified[pred] for pred in predecessors if pred in classified}
+        
+        logger.debug("Executing node %s (%s)", node.id, node.type)
+        logger.debug("Input data for %s: %s", node.id, input_data)
+        
+        context = NodeExecutionContext(node, input_data, api_manager, user_id, inputs)
+        return await self._execute_single_node(context)
+    
+    async def _preload_document(self, result: NodeResult) -> NodeResult:
+        """Read a parsed document once, off the event loop, so every downstream consumer shares it."""
+        try:
+            parsed_data = await asyncio.to_thread(load_parsed_document, result)
+        except Exception as e:
+            # Consumers retry the read and report the error themselves
+            logger.warning("Could not preload parsed document %s: %s", result.path, e)
+            return result
+        
+        # Keep only the preview in memory for the rest of the run when there is one;
+        # the loaded dict is shared through the parsed-document cache, so copy it
+        if "content_preview" in parsed_data:
+            parsed_data = {key: value for key, value in parsed_data.items() if key != "content"}
+        return replace(result, data=parsed_data)
+    
     async def _execute_single_node(self, context: NodeExecutionContext) -> str:
         """Execute a single node."""
-        print(f"Executing {context.node.type} node: {context.node.id}")
+        node_type = context.node.type
+        logger.debug("Executing %s node: %s", node_type, context.node.id)
         
         # Try to use specific executor
-        executor = NodeExecutorFactory.create_executor(context.node.type)
+        executor = NodeExecutorFactory.create_executor(node_type)
         if executor:
             result = await executor.execute(context)
             if result.success:
                 return result.data
             else:
-                return result.error_message or f"Error executing {context.node.type} node"
+                return result.error_message or f"Error executing {node_type} node"
         
         # Fallback to legacy execution for non-refactored nodes
         return await self._execute_legacy_node(context)
@@ -795,32 +1107,35 @@ class WorkflowEngine:
     async def _execute_legacy_node(self, context: NodeExecutionContext) -> str:
         """Execute node using legacy method (for nodes not yet refactored)."""
         node = context.node
+        data = node.data
+        node_type = node.type
         input_data = context.input_data or {}
         api_manager = context.api_manager
         
         try:
-            if node.type == "webhook":
-                print(f"Processing webhook node with data: {node.data}")
-                result = await run_webhook_node(node.data)
-                print(f"Webhook node completed: {result}")
+            if node_type == "webhook":
+                logger.debug("Processing webhook node with data: %s", data)
+                result = await run_webhook_node(data)
+                logger.debug("Webhook node completed: %s", result)
                 return result
                 
-            elif node.type == "whatsapp":
+            elif node_type == "whatsapp":
                 return await self._execute_messaging_node(context)
                 
-            elif node.type == "google_sheets":
-                spreadsheet_id = node.data.get("spreadsheet_id")
-                range_name = node.data.get("range")
-                values = node.data.get("values", [])
+            elif node_type == "google_sheets":
+                spreadsheet_id = data.get("spreadsheet_id")
+                range_name = data.get("range")
+                values = _ensure_2d(data.get("values", []))
                 user_google_token_json = await api_manager.get_google_token_json() if api_manager else None
 
                 if _require_user_owned_keys() and not user_google_token_json:
                     return "Missing user Google token. Add google_token_json in Settings > API Keys."
                 
                 # Check for parsed document data
-                for pred_id, pred_result in input_data.items():
-                    if "Document parsed:" in str(pred_result):
-                        values = self._extract_sheet_values_from_document(pred_result)
+                for pred_id, pred_result in context.inputs.items():
+                    if pred_result.kind == "document":
+                        # May read the parsed file and builds every row; keep it off the loop
+                        values = await asyncio.to_thread(self._extract_sheet_values_from_document, pred_result)
                         if values:
                             break
 
@@ -831,33 +1146,34 @@ class WorkflowEngine:
                 result = write_to_sheet(
                     spreadsheet_id,
                     range_name,
-                    [values] if isinstance(values[0], str) else values,
+                    values,
                     token_json=user_google_token_json,
                 )
                 return result
                 
-            elif node.type == "schedule":
-                cron_expr = node.data.get("cron", "*/1 * * * *")
+            elif node_type == "schedule":
+                cron_expr = data.get("cron", "*/1 * * * *")
                 return f"Schedule set: {cron_expr}"
 
-            elif node.type == "gmail_trigger":
+            elif node_type == "gmail_trigger":
                 return await self._execute_gmail_trigger_node(context)
                 
-            elif node.type == "document_parser":
-                file_path = self._get_document_parser_file_path(node, input_data)
-                updated_data = {**node.data, "file_path": file_path}
+            elif node_type == "document_parser":
+                file_path = self._get_document_parser_file_path(node, context.inputs)
+                # Read-only overlay; the parser only looks fields up
+                updated_data = ChainMap({"file_path": file_path}, data)
                 return await self._execute_document_parser(updated_data)
                 
-            elif node.type == "report_generator":
-                return await self._execute_report_generator(node, input_data, api_manager)
+            elif node_type == "report_generator":
+                return await self._execute_report_generator(node, input_data, context.inputs, api_manager)
                 
-            elif node.type == "social_media":
-                return await self._execute_social_media_node(node, input_data, api_manager)
+            elif node_type == "social_media":
+                return await self._execute_social_media_node(node, context.inputs)
             
-            return f"{node.type} node not implemented"
+            return f"{node_type} node not implemented"
             
         except Exception as e:
-            return f"Error executing {node.type} node {node.id}: {str(e)}"
+            return f"Error executing {node_type} node {node.id}: {str(e)}"
 
     async def _execute_gmail_trigger_node(self, context: NodeExecutionContext) -> str:
         """Execute Gmail trigger node and return latest email event summary."""
@@ -873,32 +1189,26 @@ class WorkflowEngine:
         # They are armed by scheduler in main.py and fired only by listener payload.
         return "Gmail trigger armed and listening for new emails"
     
-    def _extract_sheet_values_from_document(self, pred_result: str) -> Optional[List[List[str]]]:
+    def _extract_sheet_values_from_document(self, result: NodeResult) -> Optional[List[List[str]]]:
         """Extract sheet values from parsed document."""
         try:
-            json_path = pred_result.split("Document parsed: ")[-1]
-            with open(json_path, 'r', encoding='utf-8') as f:
-                parsed_data = json.load(f)
+            parsed_data = load_parsed_document(result)
             
             if parsed_data.get('type') == 'excel':
                 sheets = parsed_data.get('sheets', {})
                 if sheets:
-                    first_sheet = list(sheets.values())[0]
-                    sheet_values = [first_sheet['columns']]
-                    for row_data in first_sheet['data']:
-                        row = [str(row_data.get(col, '')) for col in first_sheet['columns']]
-                        sheet_values.append(row)
-                    return sheet_values
+                    first_sheet = next(iter(sheets.values()))
+                    return document_parser.sheet_rows(first_sheet)
             else:
                 metadata = parsed_data.get('metadata', {})
                 return [
                     ["Document Info", "Value"],
                     ["File Name", metadata.get('file_name', '')],
                     ["Type", parsed_data.get('type', '')],
-                    ["Content", parsed_data.get('content', '')[:1000]]
+                    ["Content", document_preview(parsed_data, 1000)[0]]
                 ]
         except Exception as e:
-            print(f"Error reading parsed document for sheets: {str(e)}")
+            logger.warning("Error reading parsed document for sheets: %s", e)
         return None
 
     def _extract_sheet_values_from_upstream(self, input_data: Dict[str, Any]) -> List[List[str]]:
@@ -921,7 +1231,7 @@ class WorkflowEngine:
                 structured_tables.append(table)
                 continue
 
-            pred_text = str(pred_result).strip()
+            pred_text = (pred_result if isinstance(pred_result, str) else str(pred_result)).strip()
             if pred_text:
                 fallback_rows.append([pred_id, pred_text])
 
@@ -985,13 +1295,13 @@ class WorkflowEngine:
         if code_match:
             candidate = code_match.group(1).strip()
             try:
-                return json.loads(candidate)
+                return _json_loads(candidate)
             except Exception:
                 pass
 
         # 2) Raw JSON
         try:
-            return json.loads(raw)
+            return _json_loads(raw)
         except Exception:
             pass
 
@@ -1023,46 +1333,39 @@ class WorkflowEngine:
                 return str(value)
         return str(value)
     
-    def _get_document_parser_file_path(self, node: Node, input_data: Dict[str, Any]) -> str:
+    def _get_document_parser_file_path(self, node: Node, inputs: Dict[str, NodeResult]) -> str:
         """Get file path for document parser with enhanced download capability."""
         file_path = node.data.get("file_path", "")
         
-        for pred_id, pred_result in input_data.items():
-            pred_str = str(pred_result)
-            if "File uploaded:" in pred_str:
-                drive_url = pred_str.split("File uploaded: ")[-1].strip()
-                print(f"📥 Attempting to download file for parsing: {drive_url}")
-                return drive_url  # Return the URL directly, handle download in async method
+        for pred_id, result in inputs.items():
+            if result.kind == "file":
+                logger.info("📥 Attempting to download file for parsing: %s", result.path)
+                return result.path  # Return the URL directly, handle download in async method
             # If the predecessor already returned a parsed document path, pass it through
-            if "Document parsed:" in pred_str:
-                parsed_path = pred_str.split("Document parsed: ")[-1].strip()
-                if os.path.exists(parsed_path):
-                    return parsed_path
-        
-        # Use the pre-configured file path from node data
-        if file_path and os.path.exists(file_path):
-            print(f"📄 Using pre-configured document: {file_path}")
-            return file_path
+            if result.kind == "document" and os.path.exists(result.path):
+                return result.path
         
+        # Use the pre-configured file path from node data; existence is checked
+        # once by the parser step
+        if file_path:
+            logger.debug("📄 Using pre-configured document: %s", file_path)
         return file_path
 
     async def _execute_messaging_node(self, context: NodeExecutionContext) -> str:
         """Execute WhatsApp Cloud API node."""
         node = context.node
-        input_data = context.input_data or {}
         api_manager = context.api_manager
 
         # Build message, optionally appending predecessor output
         message = node.data.get("message", "")
         if not message:
             # Use predecessor output as the message body
-            for pred_result in input_data.values():
-                pred_str = str(pred_result)
-                if pred_str and not pred_str.startswith("Schedule set:"):
-                    message = pred_str
+            for result in context.inputs.values():
+                if result.kind != "schedule":
+                    message = result.text
                     break
 
-        node_data = {**node.data, "message": message}
+        node_data = _override(node.data, message=message)
 
         user_whatsapp_token = None
         user_whatsapp_phone_number_id = None
@@ -1082,35 +1385,12 @@ class WorkflowEngine:
                 "Add WhatsApp token and phone_number_id in Settings > API Keys."
             )
 
-        print(f"Executing whatsapp node: {node.id}")
+        logger.debug("Executing whatsapp node: %s", node.id)
         return await run_whatsapp_node(node_data)
 
     async def _execute_document_parser(self, node_data: Dict[str, Any]) -> str:
-        """Execute document parser with enhanced file handling and cleanup."""
-        print(f"🔧 Attempting to import document parser...")
-        
-        # Get the file path (potentially a URL that needs downloading)
-        file_path_or_url = node_data.get("file_path", "")
-        
-        # Check if we need to download the file first
-        if file_path_or_url.startswith("http"):
-            print(f"📥 Need to download file from: {file_path_or_url}")
-            try:
-                # Download the file asynchronously
-                local_path = await self._download_file_for_parsing(file_path_or_url)
-                if local_path:
-                    print(f"✅ Successfully downloaded file to: {local_path}")
-                    # Update node data with local path
-                    node_data = {**node_data, "file_path": local_path}
-                    file_path = local_path
-                    is_temp_file = local_path.startswith("temp_downloads")
-                else:
-                    return "Error: Failed to download file for parsing"
-            except Exception as e:
-                return f"Error: Failed to download file: {str(e)}"
-        else:
-            file_path = file_path_or_url
-            is_temp_file = file_path.startswith("temp_downloads") if file_path else False
+        """Execute document parser on the uploaded file configured on the node."""
+        file_path = node_data.get("file_path", "")
         
         # Validate that we have a file path
         if not file_path:
@@ -1120,176 +1400,147 @@ class WorkflowEngine:
             return f"Error: File not found at path: {file_path}. Please re-upload the document in the node settings."
         
         try:
-            # Try multiple import methods
-            methods = [
-                lambda: self._import_document_parser_method1(),
-                lambda: self._import_document_parser_method2(),
-                lambda: self._import_document_parser_method3(),
-                lambda: self._import_document_parser_method4(),
-            ]
-            
-            for i, method in enumerate(methods, 1):
-                try:
-                    run_document_parser_node = method()
-                    print(f"✅ Method {i}: Successfully imported document parser")
-                    
-                    # Execute document parsing
-                    result = await run_document_parser_node(node_data)
-                    
-                    # Clean up temporary file if needed
-                    if is_temp_file:
-                        await self._cleanup_temp_files(file_path)
-                    
-                    return result
-                    
-                except Exception as e:
-                    print(f"❌ Method {i} failed: {str(e)}")
-                    continue
-            
-            # If all methods fail
-            error_msg = (
-                f"Error: Could not import document parser service. "
-                f"Tried {len(methods)} different methods. "
-                f"File path: {file_path}"
-            )
-            print(f"❌ {error_msg}")
-            
-            # Clean up temporary file even on failure
-            if is_temp_file:
-                await self._cleanup_temp_files(file_path)
-            
-            return error_msg
-            
+            return await document_parser.run_document_parser_node(node_data)
         except Exception as e:
-            # Clean up temporary file on any error
-            if is_temp_file:
-                await self._cleanup_temp_files(file_path)
-            
             error_msg = f"Document parsing failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return error_msg
     
-    def _import_document_parser_method1(self):
-        from services.document_parser import run_document_parser_node
-        return run_document_parser_node
-    
-    def _import_document_parser_method2(self):
-        import services.document_parser as doc_parser
-        return doc_parser.run_document_parser_node
-    
-    def _import_document_parser_method3(self):
-        import importlib
-        doc_parser_module = importlib.import_module('services.document_parser')
-        return getattr(doc_parser_module, 'run_document_parser_node')
-    
-    def _import_document_parser_method4(self):
-        services_path = os.path.join(os.path.dirname(__file__), '..', '..', 'services')
-        abs_services_path = os.path.abspath(services_path)
-        
-        if abs_services_path not in sys.path:
-            sys.path.insert(0, abs_services_path)
-            print(f"Added to path: {abs_services_path}")
-        
-        from services import run_document_parser_node
-        return run_document_parser_node
-    
-    async def _execute_report_generator(self, node: Node, input_data: Dict[str, Any], api_manager: Any = None) -> str:
+    async def _execute_report_generator(
+        self,
+        node: Node,
+        input_data: Dict[str, Any],
+        inputs: Dict[str, NodeResult],
+        api_manager: Any = None,
+    ) -> str:
         """Execute report generator with enhanced content from all connected nodes."""
         title = node.data.get("title", "AutoFlow Report")
         content = node.data.get("content", "")
         format_type = node.data.get("format", "pdf")
         google_token_json = await api_manager.get_google_token_json() if api_manager else None
         
-        report_content = content if content else "# AutoFlow Workflow Report\n\n"
-        report_data = {}
+        # Predecessors are independent, so their sections (which may download and
+        # parse uploaded files) are built concurrently and assembled in input order
+        sections = await asyncio.gather(*(
+            self._build_report_section(pred_id, result, google_token_json)
+            for pred_id, result in inputs.items()
+        ))
         
-        # Enhanced processing of input data for report content
-        for pred_id, pred_result in input_data.items():
-            if pred_result and isinstance(pred_result, str):
-                print(f"📊 Processing input from node {pred_id}: {pred_result[:100]}...")
-                
-                if "File uploaded:" in pred_result:
-                    report_content, report_data = await self._add_file_upload_content_to_report(
-                        report_content, report_data, pred_result, pred_id, google_token_json)
-                elif "Document parsed:" in pred_result:
-                    report_content, report_data = self._add_document_content_to_report(
-                        report_content, report_data, pred_result)
-                elif ContentProcessor._is_ai_content(pred_result):
-                    ai_model = ContentProcessor._determine_ai_model(pred_id)
-                    report_content += f"## {ai_model} Analysis\n\n{pred_result}\n\n"
-                    report_data[f"ai_response_{pred_id}"] = pred_result[:200] + "..." if len(pred_result) > 200 else pred_result
-                elif "Image generated:" in pred_result:
-                    image_path = pred_result.split("Image generated: ")[-1]
-                    image_filename = os.path.basename(image_path)
-                    report_content += f"## Generated Image\n\nImage created: {image_filename}\n\n"
-                    report_data["generated_image"] = image_filename
-                elif "Email sent successfully" in pred_result:
-                    report_content += f"## Email Notification\n\n{pred_result}\n\n"
-                    report_data[f"email_result_{pred_id}"] = pred_result
-                elif "Webhook" in pred_result and "executed successfully" in pred_result:
-                    report_content += f"## Webhook Execution\n\n{pred_result}\n\n"
-                    report_data[f"webhook_result_{pred_id}"] = pred_result
-                else:
-                    # Generic result processing
-                    report_content += f"## Node {pred_id} Result\n\n{pred_result}\n\n"
-                    report_data[f"node_result_{pred_id}"] = pred_result[:100] + "..." if len(pred_result) > 100 else pred_result
+        report_parts = [content if content else "# AutoFlow Workflow Report\n\n"]
+        report_data = {}
+        for section_content, section_data in sections:
+            report_parts.append(section_content)
+            report_data.update(section_data)
+        report_content = "".join(report_parts)
         
         # Add workflow metadata
         report_data.update({
-            "workflow_execution_time": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "workflow_execution_time": time.strftime('%Y-%m-%d %H:%M:%S'),
             "total_nodes_processed": len(input_data),
             "report_generated_by": "AutoFlow Report Generator",
-            "input_node_count": len([pred_id for pred_id, result in input_data.items() if result])
+            "input_node_count": len(inputs)
         })
         
-        updated_data = {
-            **node.data,
-            "title": title,
-            "content": report_content,
-            "format": format_type,
-            "data": report_data
-        }
+        updated_data = _override(node.data, title=title, content=report_content, format=format_type, data=report_data)
         
-        print(f"📊 Generated report with {len(report_content)} characters of content")
-        print(f"📈 Report data keys: {list(report_data.keys())}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Generated report with %d characters of content, data keys: %s",
+                         len(report_content), list(report_data))
+        
+        return await report_generator.run_report_generator_node(updated_data)
+
+    async def _build_report_section(
+        self,
+        pred_id: str,
+        result: NodeResult,
+        google_token_json: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Report content and data contributed by one predecessor result."""
+        pred_result = result.text
+        logger.debug("📊 Processing input from node %s: %.100s...", pred_id, pred_result)
+        
+        if result.kind == "file":
+            return await self._add_file_upload_content_to_report(
+                "", {}, result.path, pred_id, google_token_json)
+        if result.kind == "document":
+            return await self._add_document_content_to_report("", {}, result, pred_id)
+        if result.kind == "ai":
+            ai_model = ContentProcessor._determine_ai_model(pred_id)
+            summary = _preview(pred_result, 200)
+            return f"## {ai_model} Analysis\n\n{pred_result}\n\n", {f"ai_response_{pred_id}": summary}
+        if result.kind == "image":
+            image_filename = os.path.basename(result.path)
+            return f"## Generated Image\n\nImage created: {image_filename}\n\n", {"generated_image": image_filename}
+        if result.kind == "email":
+            return f"## Email Notification\n\n{pred_result}\n\n", {f"email_result_{pred_id}": pred_result}
+        if result.kind == "webhook":
+            return f"## Webhook Execution\n\n{pred_result}\n\n", {f"webhook_result_{pred_id}": pred_result}
+        
+        # Generic result processing
+        summary = _preview(pred_result, 100)
+        return f"## Node {pred_id} Result\n\n{pred_result}\n\n", {f"node_result_{pred_id}": summary}
+
+    async def _execute_social_media_node(self, node: Node, inputs: Dict[str, NodeResult]) -> str:
+        """Post to social media with the node's content enriched by upstream results."""
+        data = node.data
+        parts = [data.get("content", "")]
+        image_path = data.get("image_path", "")
+        
+        for pred_id, result in inputs.items():
+            if result.kind == "ai":
+                parts.append(result.text)
+            elif result.kind == "image" and not image_path:
+                # Written by the image node in this run; the service checks it before use,
+                # so no extra stat() here
+                image_path = result.path
+            elif result.kind == "document":
+                try:
+                    parsed_data = await asyncio.to_thread(load_parsed_document, result)
+                except Exception as e:
+                    logger.warning("⚠️ Could not read parsed document %s: %s", result.path, e)
+                    continue
+                summary, truncated = document_preview(parsed_data, 200)
+                if summary.strip():
+                    parts.append(f"📄 Document Summary: {summary}{'…' if truncated else ''}")
         
-        return await run_report_generator_node(updated_data)
+        content = "\n\n".join(part for part in parts if part and part.strip())
+        return await run_social_media_node(_override(data, content=content, image_path=image_path))
 
     async def _add_file_upload_content_to_report(
         self,
         content: str,
         data: Dict[str, Any],
-        pred_result: str,
+        file_url: str,
         pred_id: str,
         google_token_json: Optional[str] = None,
     ) -> tuple:
         """Enhanced file upload content processing for reports."""
+        parts = [content]
         try:
-            file_url = pred_result.split("File uploaded: ")[-1].strip()
-            print(f"📁 Processing uploaded file for report: {file_url}")
+            logger.debug("📁 Processing uploaded file for report: %s", file_url)
             
             # Extract file ID from Google Drive URL and get file info
-            if "drive.google.com" in file_url and "/d/" in file_url:
-                file_id = file_url.split("/d/")[1].split("/")[0]
-                print(f"📋 Extracted file ID: {file_id}")
+            _, has_id, id_part = file_url.partition("/d/")
+            if has_id and "drive.google.com" in file_url:
+                file_id = id_part.partition("/")[0]
+                logger.debug("📋 Extracted file ID: %s", file_id)
                 
                 # Try to get file metadata
                 try:
-                    from services.file_upload import get_drive_file_info
                     file_info_result = await get_drive_file_info(file_id, token_json=google_token_json)
                     
                     if file_info_result.get("success"):
                         file_info = file_info_result["file_info"]
                         
-                        content += f"## Uploaded File Analysis\n\n"
-                        content += f"**File Name:** {file_info.get('name', 'Unknown')}\n\n"
-                        content += f"**File Type:** {file_info.get('mimeType', 'Unknown')}\n\n"
-                        content += f"**File Size:** {self._format_file_size(file_info.get('size'))}\n\n"
-                        content += f"**Upload Date:** {file_info.get('createdTime', 'Unknown')}\n\n"
-                        content += f"**File URL:** [View File]({file_url})\n\n"
+                        parts.append(f"## Uploaded File Analysis\n\n")
+                        parts.append(f"**File Name:** {file_info.get('name', 'Unknown')}\n\n")
+                        parts.append(f"**File Type:** {file_info.get('mimeType', 'Unknown')}\n\n")
+                        parts.append(f"**File Size:** {self._format_file_size(file_info.get('size'))}\n\n")
+                        parts.append(f"**Upload Date:** {file_info.get('createdTime', 'Unknown')}\n\n")
+                        parts.append(f"**File URL:** [View File]({file_url})\n\n")
                         
                         if file_info.get('isGoogleWorkspace'):
-                            content += f"**Type:** Google Workspace Document\n\n"
+                            parts.append(f"**Type:** Google Workspace Document\n\n")
                         
                         # Store detailed file info in report data
                         data[f"uploaded_file_{pred_id}"] = {
@@ -1303,17 +1554,17 @@ class WorkflowEngine:
                         
                         # Try to download and analyze the file content if it's a document
                         if self._is_analyzable_file(file_info.get('mimeType', '')):
-                            content += await self._analyze_uploaded_file_content(
+                            parts.append(await self._analyze_uploaded_file_content(
                                 file_id,
                                 file_info,
                                 google_token_json,
-                            )
+                            ))
                             
                     else:
                         # Fallback if we can't get file info
-                        content += f"## Uploaded File\n\n"
-                        content += f"**File URL:** [View File]({file_url})\n\n"
-                        content += f"**Note:** Could not retrieve detailed file information.\n\n"
+                        parts.append(f"## Uploaded File\n\n")
+                        parts.append(f"**File URL:** [View File]({file_url})\n\n")
+                        parts.append(f"**Note:** Could not retrieve detailed file information.\n\n")
                         
                         data[f"uploaded_file_{pred_id}"] = {
                             "url": file_url,
@@ -1321,10 +1572,10 @@ class WorkflowEngine:
                         }
                         
                 except Exception as file_error:
-                    print(f"⚠️ Could not get file info: {str(file_error)}")
-                    content += f"## Uploaded File\n\n"
-                    content += f"**File URL:** [View File]({file_url})\n\n"
-                    content += f"**Error:** Could not retrieve file details - {str(file_error)}\n\n"
+                    logger.warning("⚠️ Could not get file info: %s", file_error)
+                    parts.append(f"## Uploaded File\n\n")
+                    parts.append(f"**File URL:** [View File]({file_url})\n\n")
+                    parts.append(f"**Error:** Could not retrieve file details - {str(file_error)}\n\n")
                     
                     data[f"uploaded_file_{pred_id}"] = {
                         "url": file_url,
@@ -1332,16 +1583,57 @@ class WorkflowEngine:
                     }
             else:
                 # Handle non-Google Drive URLs
-                content += f"## Uploaded File\n\n"
-                content += f"**File URL:** {file_url}\n\n"
+                parts.append(f"## Uploaded File\n\n")
+                parts.append(f"**File URL:** {file_url}\n\n")
                 data[f"uploaded_file_{pred_id}"] = {"url": file_url}
             
         except Exception as e:
-            print(f"❌ Error processing uploaded file: {str(e)}")
-            content += f"## File Upload Error\n\nError processing uploaded file: {str(e)}\n\n"
+            logger.error("❌ Error processing uploaded file: %s", e)
+            parts.append(f"## File Upload Error\n\nError processing uploaded file: {str(e)}\n\n")
             data[f"upload_error_{pred_id}"] = str(e)
         
-        return content, data
+        return "".join(parts), data
+
+    # Characters of a parsed document's text quoted in the report
+    REPORT_DOCUMENT_PREVIEW_CHARS = 1500
+
+    async def _add_document_content_to_report(
+        self,
+        content: str,
+        data: Dict[str, Any],
+        result: NodeResult,
+        pred_id: str,
+    ) -> tuple:
+        """Summarize a parsed document for the report from its metadata and text preview."""
+        parts = [content]
+        try:
+            parsed_data = await asyncio.to_thread(load_parsed_document, result)
+            metadata = parsed_data.get('metadata', {})
+            doc_type = parsed_data.get('type', 'Unknown')
+            preview, truncated = document_preview(parsed_data, self.REPORT_DOCUMENT_PREVIEW_CHARS)
+            
+            parts.append("## Parsed Document\n\n")
+            parts.append(f"**File Name:** {metadata.get('file_name', 'Unknown')}\n\n")
+            parts.append(f"**Document Type:** {doc_type.upper()}\n\n")
+            parts.append(f"**File Size:** {self._format_file_size(metadata.get('file_size'))}\n\n")
+            if preview.strip():
+                label = "Content Preview" if truncated else "Full Content"
+                parts.append(f"**{label}:**\n\n```\n{preview}{'…' if truncated else ''}\n```\n\n")
+            else:
+                parts.append("**Note:** No text content could be extracted from this document.\n\n")
+            
+            data[f"parsed_document_{pred_id}"] = {
+                "name": metadata.get('file_name'),
+                "type": doc_type,
+                "size": metadata.get('file_size'),
+                "path": result.path,
+            }
+        except Exception as e:
+            logger.warning("⚠️ Could not read parsed document %s: %s", result.path, e)
+            parts.append(f"## Parsed Document\n\nError reading parsed document: {str(e)}\n\n")
+            data[f"document_error_{pred_id}"] = str(e)
+        
+        return "".join(parts), data
 
     def _format_file_size(self, size_bytes):
         """Format file size in human readable format."""
@@ -1358,19 +1650,20 @@ class WorkflowEngine:
         else:
             return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
 
+    _ANALYZABLE_MIME_TYPES = (
+        'application/pdf',
+        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'text/plain',
+        'text/csv',
+        'application/json',
+        'application/vnd.google-apps.document',
+        'application/vnd.google-apps.spreadsheet'
+    )
+
     def _is_analyzable_file(self, mime_type: str) -> bool:
         """Check if file type can be analyzed for content."""
-        analyzable_types = [
-            'application/pdf',
-            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'text/plain',
-            'text/csv',
-            'application/json',
-            'application/vnd.google-apps.document',
-            'application/vnd.google-apps.spreadsheet'
-        ]
-        return any(mime_type.startswith(t) for t in analyzable_types)
+        return mime_type.startswith(self._ANALYZABLE_MIME_TYPES)
 
     async def _analyze_uploaded_file_content(
         self,
@@ -1380,7 +1673,7 @@ class WorkflowEngine:
     ) -> str:
         """Download and analyze file content for the report with enhanced resume analysis."""
         try:
-            print(f"🔍 Attempting to analyze file content for report...")
+            logger.debug("🔍 Attempting to analyze file content for report...")
             
             # Download the file
             local_path = await download_from_drive(file_id, token_json=google_token_json)
@@ -1388,127 +1681,130 @@ class WorkflowEngine:
                 return "**Content Analysis:** Could not download file for analysis.\n\n"
             
             # Parse the document
+            json_path = None
             try:
-                from services.document_parser import run_document_parser_node
-                parse_result = await run_document_parser_node({"file_path": local_path})
+                parse_result = await document_parser.run_document_parser_node({"file_path": local_path})
                 
-                if "Document parsed:" in parse_result:
-                    json_path = parse_result.split("Document parsed: ")[-1]
-                    
-                    if os.path.exists(json_path):
-                        with open(json_path, 'r', encoding='utf-8') as f:
-                            parsed_data = json.load(f)
-                        
-                        content_analysis = "### Content Analysis\n\n"
-                        
-                        # Add document metadata
-                        metadata = parsed_data.get('metadata', {})
-                        document_content = parsed_data.get('content', '')
-                        
-                        # Enhanced analysis for resume files
-                        if self._is_resume_file(file_info.get('name', ''), document_content):
-                            content_analysis += await self._analyze_resume_content(document_content, metadata)
-                        else:
-                            # General document analysis
-                            content_analysis += self._analyze_general_document(document_content, metadata, parsed_data)
-                        
-                        # Cleanup temp files
-                        try:
-                            if local_path.startswith("downloads"):
-                                os.remove(local_path)
-                            if os.path.exists(json_path):
-                                os.remove(json_path)
-                        except:
-                            pass
-                        
-                        return content_analysis
-                    
-                else:
+                parsed = classify_result(parse_result)
+                if parsed is None or parsed.kind != "document":
                     return f"**Content Analysis:** {parse_result}\n\n"
+                
+                json_path = parsed.path
+                if not os.path.exists(json_path):
+                    return "**Content Analysis:** Parsed output was not found.\n\n"
+                
+                parsed_data = await asyncio.to_thread(_load_json_file, json_path)
+                
+                content_analysis = "### Content Analysis\n\n"
+                
+                # Add document metadata
+                metadata = parsed_data.get('metadata', {})
+                document_content = parsed_data.get('content', '')
+                
+                # Enhanced analysis for resume files
+                if self._is_resume_file(file_info.get('name', ''), document_content):
+                    content_analysis += await self._analyze_resume_content(document_content, metadata)
+                else:
+                    # General document analysis
+                    content_analysis += self._analyze_general_document(document_content, metadata, parsed_data)
+                
+                return content_analysis
                     
             except Exception as parse_error:
-                print(f"⚠️ Document parsing failed: {str(parse_error)}")
+                logger.warning("⚠️ Document parsing failed: %s", parse_error)
                 return f"**Content Analysis:** Could not parse document - {str(parse_error)}\n\n"
+            finally:
+                # Only the analysis text goes into the report; drop the downloaded
+                # file and its parse output whatever the outcome
+                self._remove_analysis_files(local_path, json_path)
                 
         except Exception as e:
-            print(f"⚠️ File analysis error: {str(e)}")
+            logger.warning("⚠️ File analysis error: %s", e)
             return f"**Content Analysis:** Analysis failed - {str(e)}\n\n"
 
+    @staticmethod
+    def _remove_analysis_files(local_path: str, json_path: Optional[str]) -> None:
+        """Remove the temporary files of an uploaded-file analysis."""
+        try:
+            if local_path.startswith("downloads"):
+                os.remove(local_path)
+            if json_path and os.path.exists(json_path):
+                os.remove(json_path)
+        except OSError:
+            pass
+
+    _RESUME_FILENAME_RE = re.compile(r"resume|cv|curriculum|vitae")
+    _RESUME_CONTENT_KEYWORDS = (
+        'experience', 'education', 'skills', 'employment', 'work history',
+        'qualifications', 'achievements', 'objective', 'summary', 'career',
+        'projects', 'certifications', 'languages', 'references'
+    )
+
     def _is_resume_file(self, filename: str, content: str) -> bool:
         """Check if the file appears to be a resume/CV."""
-        filename_lower = filename.lower()
-        content_lower = content.lower()
-        
         # Check filename indicators
-        resume_keywords_filename = ['resume', 'cv', 'curriculum', 'vitae']
-        filename_indicators = any(keyword in filename_lower for keyword in resume_keywords_filename)
+        if self._RESUME_FILENAME_RE.search(filename.lower()):
+            return True
         
         # Check content indicators
-        resume_keywords_content = [
-            'experience', 'education', 'skills', 'employment', 'work history',
-            'qualifications', 'achievements', 'objective', 'summary', 'career',
-            'projects', 'certifications', 'languages', 'references'
-        ]
-        content_indicators = sum(1 for keyword in resume_keywords_content if keyword in content_lower)
+        content_lower = content.lower()
+        content_indicators = sum(1 for keyword in self._RESUME_CONTENT_KEYWORDS if keyword in content_lower)
         
-        return filename_indicators or content_indicators >= 3
+        return content_indicators >= 3
 
     async def _analyze_resume_content(self, content: str, metadata: dict) -> str:
         """Analyze resume content and extract key information."""
-        analysis = "**Document Type:** Resume/CV\n\n"
+        parts = ["**Document Type:** Resume/CV\n\n"]
         
         if metadata:
             if 'character_count' in metadata:
-                analysis += f"**Character Count:** {metadata['character_count']:,}\n"
+                parts.append(f"**Character Count:** {metadata['character_count']:,}\n")
             if 'word_count' in metadata:
-                analysis += f"**Word Count:** {metadata['word_count']:,}\n"
-            analysis += "\n"
+                parts.append(f"**Word Count:** {metadata['word_count']:,}\n")
+            parts.append("\n")
         
         # Extract key sections
         sections = self._extract_resume_sections(content)
         
         if sections:
-            analysis += "**Resume Structure Analysis:**\n\n"
+            parts.append("**Resume Structure Analysis:**\n\n")
             
             for section_name, section_content in sections.items():
                 if section_content:
-                    analysis += f"- **{section_name}:** {len(section_content)} characters\n"
+                    parts.append(f"- **{section_name}:** {len(section_content)} characters\n")
             
-            analysis += "\n"
+            parts.append("\n")
         
         # Extract key information
         key_info = self._extract_key_resume_info(content)
         
         if key_info:
-            analysis += "**Key Information Extracted:**\n\n"
+            parts.append("**Key Information Extracted:**\n\n")
             
             if key_info.get('contact_info'):
-                analysis += f"- **Contact Information:** Found {len(key_info['contact_info'])} contact items\n"
+                parts.append(f"- **Contact Information:** Found {len(key_info['contact_info'])} contact items\n")
             
             if key_info.get('skills'):
-                analysis += f"- **Skills Mentioned:** {len(key_info['skills'])} skills identified\n"
+                parts.append(f"- **Skills Mentioned:** {len(key_info['skills'])} skills identified\n")
             
             if key_info.get('experience_years'):
-                analysis += f"- **Experience Indicators:** {key_info['experience_years']} year references found\n"
+                parts.append(f"- **Experience Indicators:** {key_info['experience_years']} year references found\n")
             
             if key_info.get('education'):
-                analysis += f"- **Education:** {len(key_info['education'])} education-related terms\n"
+                parts.append(f"- **Education:** {len(key_info['education'])} education-related terms\n")
             
-            analysis += "\n"
+            parts.append("\n")
         
         # Content preview
         if len(content) > 500:
-            content_preview = content[:500] + "..."
-            analysis += f"**Content Preview:**\n\n```\n{content_preview}\n```\n\n"
+            parts.append(f"**Content Preview:**\n\n```\n{_preview(content, 500)}\n```\n\n")
         else:
-            analysis += f"**Full Content:**\n\n```\n{content}\n```\n\n"
+            parts.append(f"**Full Content:**\n\n```\n{content}\n```\n\n")
         
-        return analysis
+        return "".join(parts)
 
     def _extract_resume_sections(self, content: str) -> dict:
         """Extract common resume sections."""
-        import re
-        
         sections = {}
         content_lower = content.lower()
         
@@ -1531,8 +1827,6 @@ class WorkflowEngine:
 
     def _extract_key_resume_info(self, content: str) -> dict:
         """Extract key resume information."""
-        import re
-        
         key_info = {}
         
         # Extract contact information patterns
@@ -1557,7 +1851,9 @@ class WorkflowEngine:
             'data analysis', 'project management', 'leadership', 'communication'
         ]
         
-        found_skills = [skill for skill in skill_keywords if skill.lower() in content.lower()]
+        # Lowercase the (possibly long) content once for all keyword checks
+        content_lower = content.lower()
+        found_skills = [skill for skill in skill_keywords if skill in content_lower]
         key_info['skills'] = found_skills
         
         # Extract experience years
@@ -1571,41 +1867,40 @@ class WorkflowEngine:
             'graduate', 'undergraduate', 'diploma', 'certification'
         ]
         
-        found_education = [edu for edu in education_keywords if edu.lower() in content.lower()]
+        found_education = [edu for edu in education_keywords if edu in content_lower]
         key_info['education'] = found_education
         
         return key_info
 
     def _analyze_general_document(self, content: str, metadata: dict, parsed_data: dict) -> str:
         """Analyze general document content."""
-        analysis = f"**Document Type:** {parsed_data.get('type', 'Unknown').upper()}\n\n"
+        parts = [f"**Document Type:** {parsed_data.get('type', 'Unknown').upper()}\n\n"]
         
         # Add document metadata
         if metadata:
             if 'character_count' in metadata:
-                analysis += f"**Character Count:** {metadata['character_count']:,}\n"
+                parts.append(f"**Character Count:** {metadata['character_count']:,}\n")
             if 'word_count' in metadata:
-                analysis += f"**Word Count:** {metadata['word_count']:,}\n"
-            analysis += "\n"
+                parts.append(f"**Word Count:** {metadata['word_count']:,}\n")
+            parts.append("\n")
         
         # Add Excel-specific information
         if parsed_data.get('type') == 'excel':
             sheets = parsed_data.get('sheets', {})
             if sheets:
-                analysis += f"**Spreadsheet Information:**\n\n"
+                parts.append(f"**Spreadsheet Information:**\n\n")
                 for sheet_name, sheet_data in sheets.items():
-                    analysis += f"- **{sheet_name}:** {sheet_data.get('shape', {}).get('rows', 0)} rows, {sheet_data.get('shape', {}).get('columns', 0)} columns\n"
-                analysis += "\n"
+                    parts.append(f"- **{sheet_name}:** {sheet_data.get('shape', {}).get('rows', 0)} rows, {sheet_data.get('shape', {}).get('columns', 0)} columns\n")
+                parts.append("\n")
         
         # Content preview
         if content:
             if len(content) > 1000:
-                content_summary = content[:1000] + "..."
-                analysis += f"**Content Preview:**\n\n```\n{content_summary}\n```\n\n"
+                parts.append(f"**Content Preview:**\n\n```\n{_preview(content, 1000)}\n```\n\n")
             else:
-                analysis += f"**Full Content:**\n\n```\n{content}\n```\n\n"
+                parts.append(f"**Full Content:**\n\n```\n{content}\n```\n\n")
         
-        return analysis
+        return "".join(parts)
 
 # Global workflow engine instance
 workflow_engine = WorkflowEngine()
@@ -1613,17 +1908,17 @@ workflow_engine = WorkflowEngine()
 # Maintain backward compatibility
 scheduler = workflow_engine.scheduler.scheduler
 
-def schedule_task(cron_expr: str, workflow: Dict[str, Any]) -> None:
-    """Schedule a workflow task (backward compatibility)."""
-    workflow_engine.scheduler.schedule_task(cron_expr, workflow)
-
 def parse_cron_expr(expr: str) -> Dict[str, str]:
     """Parse cron expression (backward compatibility)."""
     return workflow_engine.scheduler._parse_cron_expr(expr)
 
-def run_workflow_sync(workflow: Dict[str, Any]) -> Any:
-    """Run workflow synchronously (backward compatibility)."""
-    return workflow_engine.scheduler._run_workflow_sync(workflow)
+def start_scheduler(loop: asyncio.AbstractEventLoop) -> None:
+    """Start the workflow scheduler on the app's event loop."""
+    workflow_engine.scheduler.start(loop)
+
+def shutdown_scheduler() -> None:
+    """Stop the workflow scheduler."""
+    workflow_engine.scheduler.shutdown()
 
 async def run_workflow_engine(nodes: List[Node], edges: List[Edge], user_id: str = None) -> Dict[str, Any]:
     """Run workflow engine (backward compatibility)."""
@@ -17,7 +17,7 @@ async def create_user(user_data: Dict[str, Any]) -> Dict[str, Any]:
             raise ValueError("User with this email already exists")
         
         # Hash password
-        hashed_password = hash_password(user_data["password"])
+        hashed_password = await hash_password(user_data["password"])
         
         # Create user document
         user_doc = {
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, File, UploadFile, Depends, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, ValidationError
@@ -6,6 +6,9 @@ from typing import List, Dict, Optional, Any
 from dotenv import load_dotenv
 import os
 import json
+import logging
+import logging.handlers
+import queue
 import re
 import asyncio
 from urllib.parse import quote_plus
@@ -13,6 +16,19 @@ from urllib.parse import quote_plus
 # Load .env from the backend directory regardless of where uvicorn is launched from
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
+# Handlers only enqueue records; the stream write happens on the listener's
+# thread so request handlers and workflow runs never block on stdout
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(levelname)s:%(name)s:%(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)],
+)
+_log_listener.start()
+
+logger = logging.getLogger(__name__)
+
 from .models.workflow import Node, Edge, Workflow
 from .prompts.workflow_prompt import (
     SYSTEM_PROMPT,
@@ -21,22 +37,28 @@ from .prompts.workflow_prompt import (
     NODE_DATA_FIELDS,
 )
 from .models.webhook import WebhookTrigger
-from .core.runner import run_workflow_engine
-from services.gpt import run_gpt_node
+from .core.runner import (
+    run_workflow_engine,
+    start_scheduler,
+    shutdown_scheduler,
+    get_compiled_plan,
+    SCHEDULER_JOB_DEFAULTS,
+)
+from services.gpt import run_gpt_node, close_http_client
+from services.http_session import close_http_session
 from fastapi.middleware.cors import CORSMiddleware
-from services.scheduler import schedule_workflow
-from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import time
 import shutil
 from .models.user import UserCreate, UserLogin, User, UserResponse
-from .auth.auth import hash_password, verify_password, create_access_token, get_current_user
+from .auth.auth import hash_password, verify_password, create_access_token, CurrentUser
 from .database.connection import connect_to_mongo, close_mongo_connection, db
 from .database.user_operations import create_user, get_user_by_email, get_user_by_id, update_user_stats, update_last_login, update_user
 from .database.workflow_operations import save_workflow, get_user_workflows, update_workflow, delete_workflow, save_execution_history, get_execution_history
 from datetime import datetime, timedelta
 import uuid
-from .auth.email_service import send_password_reset_email
+from .auth.email_service import send_password_reset_email, close_smtp_connection
 from services.api_key_manager import get_user_api_manager
 from services.gmail_trigger import fetch_latest_email_event
 from google_auth_oauthlib.flow import Flow
@@ -59,39 +81,53 @@ app = FastAPI(title="AutoFlow API", description="Visual Workflow Automation Plat
 @app.on_event("startup")
 async def startup_event():
     """Initialize database connection on startup"""
-    global listener_event_loop
     try:
-        listener_event_loop = asyncio.get_running_loop()
+        # Scheduled jobs are coroutines and run on the serving loop
+        loop = asyncio.get_running_loop()
+        scheduler.configure(event_loop=loop)
+        scheduler.start()
+        start_scheduler(loop)
 
         # Check if we should force in-memory mode
         if os.getenv("FORCE_IN_MEMORY_DB", "").lower() == "true":
-            print("⚠️ FORCE_IN_MEMORY_DB is set to true")
-            print("⚠️ Using in-memory database instead of MongoDB")
+            logger.warning("⚠️ FORCE_IN_MEMORY_DB is set to true")
+            logger.warning("⚠️ Using in-memory database instead of MongoDB")
             from app.database.connection import use_in_memory_mode
             await use_in_memory_mode()
         else:
             await connect_to_mongo()
         
-        print("✅ AutoFlow API started successfully")
+        logger.info("✅ AutoFlow API started successfully")
         
         # Add test data in memory mode
         if db.in_memory_mode:
             await create_test_data()
             
     except Exception as e:
-        print(f"⚠️ AutoFlow API started with warnings: {str(e)}")
-        print("🔄 The API will continue to run with limited functionality")
+        logger.warning("⚠️ AutoFlow API started with warnings: %s", e)
+        logger.warning("🔄 The API will continue to run with limited functionality")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop schedulers and release long-lived connections on shutdown"""
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    shutdown_scheduler()
+    await close_smtp_connection()
+    await close_http_client()
+    await close_http_session()
+    _log_listener.stop()
 
 async def create_test_data():
     """Create some test data when running in memory mode"""
-    from .auth import hash_password
+    from .auth.auth import hash_password
     
     # Create test user
     test_user = {
         "_id": "1",
         "name": "Test User",
         "email": "test@autoflow.com",
-        "password": hash_password("password123"),
+        "password": await hash_password("password123"),
         "created_at": datetime.utcnow(),
         "is_active": True,
         "profile": {
@@ -127,8 +163,8 @@ async def create_test_data():
     # Add test workflow to in-memory database
     await db.database.workflows.insert_one(test_workflow)
     
-    print("🧪 Created test data for in-memory mode")
-    print("📝 Test user: test@autoflow.com / password123")
+    logger.debug("🧪 Created test data for in-memory mode")
+    logger.debug("📝 Test user: test@autoflow.com / password123")
 
 app.add_middleware(
     CORSMiddleware,
@@ -138,9 +174,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-scheduler = BackgroundScheduler()
-scheduler.start()
-listener_event_loop: Optional[asyncio.AbstractEventLoop] = None
+# Started in startup_event once the event loop is running; jobs added before then stay pending
+scheduler = AsyncIOScheduler(job_defaults=SCHEDULER_JOB_DEFAULTS)
 
 # Store workflows temporarily (in production, use a database)
 stored_workflows: Dict[str, Workflow] = {}
@@ -215,6 +250,14 @@ def _validate_workflow_payload(workflow_data: dict) -> Workflow:
         raise HTTPException(status_code=422, detail=exc.errors()) from exc
 
 
+def _validate_workflow_graph(workflow: Workflow) -> None:
+    """Reject workflows whose graph cannot be executed (cycles, dangling edges)."""
+    try:
+        get_compiled_plan(workflow.nodes, workflow.edges)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
 def _sanitize_workflow_payload(raw_workflow: dict) -> dict:
     """Normalize potentially noisy React Flow payload to strict workflow schema."""
     raw_nodes = raw_workflow.get("nodes", []) if isinstance(raw_workflow, dict) else []
@@ -379,7 +422,7 @@ async def _generate_valid_workflow_with_retries(
 @app.post("/workflows/generate")
 async def generate_workflow_from_prompt(
     payload: WorkflowGenerateRequest,
-    current_user_id: str = Depends(get_current_user),
+    current_user_id: str = CurrentUser,
 ):
     """Generate workflow JSON from natural language user request."""
     request_text = (payload.request or payload.user_request or "").strip()
@@ -403,7 +446,7 @@ async def generate_workflow_from_prompt(
 @app.post("/workflows/modify")
 async def modify_workflow_from_prompt(
     payload: WorkflowModifyRequest,
-    current_user_id: str = Depends(get_current_user),
+    current_user_id: str = CurrentUser,
 ):
     """Modify an existing workflow using a natural language instruction."""
     instruction = payload.instruction.strip()
@@ -437,13 +480,12 @@ async def modify_workflow_from_prompt(
         "requested_by": current_user_id,
     }
 
-def run_scheduled_workflow(workflow_id):
+async def run_scheduled_workflow(workflow_id):
     """Execute a scheduled workflow"""
-    print(f"Running scheduled workflow {workflow_id} at {time.strftime('%X')}")
+    logger.info("Running scheduled workflow %s at %s", workflow_id, time.strftime('%X'))
     if workflow_id in stored_workflows:
-        import asyncio
         workflow = stored_workflows[workflow_id]
-        asyncio.run(run_workflow_engine(workflow.nodes, workflow.edges))
+        await run_workflow_engine(workflow.nodes, workflow.edges)
 
 
 def _gmail_state_key(user_id: str, workflow_id: str, node_id: str) -> str:
@@ -467,7 +509,7 @@ async def _run_gmail_listener_once(workflow_id: str, node_id: str, user_id: str)
         # Gmail trigger should listen to the logged-in user's connected mailbox only.
         # Do not fall back to env/file tokens here to avoid cross-account behavior.
         if not token_json:
-            print(f"⚠️ Gmail listener skipped for user {user_id}: no user Gmail token connected")
+            logger.warning("⚠️ Gmail listener skipped for user %s: no user Gmail token connected", user_id)
             return
 
         query = (trigger_node.data or {}).get("query", "")
@@ -484,7 +526,7 @@ async def _run_gmail_listener_once(workflow_id: str, node_id: str, user_id: str)
         # Bootstrap state without firing historical emails.
         if not previous_message_id:
             gmail_trigger_state[state_key] = latest_message_id
-            print(f"📩 Gmail trigger initialized for {state_key}")
+            logger.debug("📩 Gmail trigger initialized for %s", state_key)
             return
 
         if previous_message_id == latest_message_id:
@@ -506,39 +548,29 @@ async def _run_gmail_listener_once(workflow_id: str, node_id: str, user_id: str)
 
         validated_flow = _validate_workflow_payload(_sanitize_workflow_payload(flow_payload))
         result = await run_workflow_engine(validated_flow.nodes, validated_flow.edges, user_id)
-        print(f"✅ Gmail trigger fired workflow {workflow_id}: {result}")
+        logger.info("✅ Gmail trigger fired workflow %s", workflow_id)
+        logger.debug("Gmail-triggered workflow %s result: %s", workflow_id, result)
 
     except Exception as e:
-        print(f"❌ Gmail listener error for workflow {workflow_id}: {str(e)}")
-
+        logger.error("❌ Gmail listener error for workflow %s: %s", workflow_id, e)
 
-def run_gmail_listener_job(workflow_id: str, node_id: str, user_id: str):
-    global listener_event_loop
 
+async def run_gmail_listener_job(workflow_id: str, node_id: str, user_id: str):
     try:
-        if listener_event_loop and listener_event_loop.is_running():
-            future = asyncio.run_coroutine_threadsafe(
-                _run_gmail_listener_once(workflow_id, node_id, user_id),
-                listener_event_loop,
-            )
-            # Keep timeout under poll interval to avoid overlapping executions.
-            future.result(timeout=50)
-        else:
-            print(
-                f"⚠️ Gmail listener loop unavailable for workflow {workflow_id}; "
-                "skipping this poll cycle"
-            )
+        # Keep timeout under poll interval to avoid overlapping executions.
+        await asyncio.wait_for(_run_gmail_listener_once(workflow_id, node_id, user_id), timeout=50)
     except Exception as e:
-        print(f"❌ Gmail listener dispatch error for workflow {workflow_id}: {str(e)}")
+        logger.error("❌ Gmail listener dispatch error for workflow %s: %s", workflow_id, e)
 
 @app.post("/workflows/save")
 async def save_user_workflow(
     workflow_data: dict, 
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Save a workflow to MongoDB"""
     try:
         validated_workflow = _validate_workflow_payload(_sanitize_workflow_payload(workflow_data))
+        _validate_workflow_graph(validated_workflow)
         workflow_name = validated_workflow.name or f"Workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         nodes = [node.dict() for node in validated_workflow.nodes]
         edges = [edge.dict() for edge in validated_workflow.edges]
@@ -552,29 +584,30 @@ async def save_user_workflow(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Save workflow error: {str(e)}")
+        logger.error("❌ Save workflow error: %s", e)
         return {"error": f"Failed to save workflow: {str(e)}"}
 
 @app.get("/workflows")
-async def get_workflows(current_user_id: str = Depends(get_current_user)):
+async def get_workflows(current_user_id: str = CurrentUser):
     """Get all workflows for the current user"""
     try:
         workflows = await get_user_workflows(current_user_id)
         return {"workflows": workflows}
         
     except Exception as e:
-        print(f"❌ Get workflows error: {str(e)}")
+        logger.error("❌ Get workflows error: %s", e)
         return {"error": f"Failed to get workflows: {str(e)}"}
 
 @app.put("/workflows/{workflow_id}")
 async def update_user_workflow(
     workflow_id: str,
     workflow_data: dict,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Update an existing workflow"""
     try:
         validated_workflow = _validate_workflow_payload(_sanitize_workflow_payload(workflow_data))
+        _validate_workflow_graph(validated_workflow)
         nodes = [node.dict() for node in validated_workflow.nodes]
         edges = [edge.dict() for edge in validated_workflow.edges]
         
@@ -587,17 +620,17 @@ async def update_user_workflow(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Update workflow error: {str(e)}")
+        logger.error("❌ Update workflow error: %s", e)
         return {"error": f"Failed to update workflow: {str(e)}"}
 
 @app.delete("/workflows/{workflow_id}")
 async def delete_user_workflow(
     workflow_id: str,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Delete a workflow"""
     try:
-        print(f"🗑️ Attempting to delete workflow {workflow_id} for user {current_user_id}")
+        logger.debug("🗑️ Attempting to delete workflow %s for user %s", workflow_id, current_user_id)
         
         success = await delete_workflow(workflow_id, current_user_id)
         
@@ -609,23 +642,23 @@ async def delete_user_workflow(
                     current_count = user.get("profile", {}).get("workflow_count", 0)
                     new_count = max(0, current_count - 1)  # Ensure it doesn't go negative
                     await update_user_stats(current_user_id, workflow_count=new_count)
-                    print(f"📊 Updated user workflow count to {new_count}")
+                    logger.debug("📊 Updated user workflow count to %s", new_count)
             except Exception as e:
-                print(f"Warning: Could not update user workflow count: {str(e)}")
+                logger.warning("Warning: Could not update user workflow count: %s", e)
             
             return {"message": "Workflow deleted successfully"}
         else:
             return {"error": "Workflow not found or you don't have permission to delete it"}
             
     except Exception as e:
-        print(f"❌ Delete workflow error: {str(e)}")
+        logger.error("❌ Delete workflow error: %s", e)
         return {"error": f"Failed to delete workflow: {str(e)}"}
 
 # Add endpoint for permanent deletion (admin only or for cleanup)
 @app.delete("/workflows/{workflow_id}/permanent")
 async def permanently_delete_workflow(
     workflow_id: str,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Permanently delete a workflow (hard delete)"""
     try:
@@ -639,17 +672,17 @@ async def permanently_delete_workflow(
             return {"error": "Workflow not found or delete failed"}
             
     except Exception as e:
-        print(f"❌ Permanent delete workflow error: {str(e)}")
+        logger.error("❌ Permanent delete workflow error: %s", e)
         return {"error": f"Failed to permanently delete workflow: {str(e)}"}
 
 @app.post("/run")
-async def run_workflow(flow_data: dict, current_user_id: str = Depends(get_current_user)):
+async def run_workflow(flow_data: dict, current_user_id: str = CurrentUser):
     """Execute workflow with user tracking and history saving"""
     flow = _validate_workflow_payload(_sanitize_workflow_payload(flow_data))
-    print(f"Received workflow with {len(flow.nodes)} nodes")
-    print(f"Node types: {[node.type for node in flow.nodes]}")
-    print(f"Edges: {len(flow.edges)}")
-    print(f"User: {current_user_id}")
+    logger.debug("Received workflow with %s nodes", len(flow.nodes))
+    logger.debug("Node types: %s", [node.type for node in flow.nodes])
+    logger.debug("Edges: %s", len(flow.edges))
+    logger.debug("User: %s", current_user_id)
 
     has_gmail_trigger = any(node.type == "gmail_trigger" for node in flow.nodes)
 
@@ -681,7 +714,7 @@ async def run_workflow(flow_data: dict, current_user_id: str = Depends(get_curre
                 id=job_id,
                 replace_existing=True,
             )
-            print(f"📩 Registered Gmail trigger listener: {job_id} (every {poll_interval} min)")
+            logger.debug("📩 Registered Gmail trigger listener: %s (every %s min)", job_id, poll_interval)
 
     # Gmail trigger workflows are event-driven. Register listeners and exit without immediate execution.
     if has_gmail_trigger:
@@ -707,9 +740,9 @@ async def run_workflow(flow_data: dict, current_user_id: str = Depends(get_curre
     start_time = time.time()
     try:
         result = await run_workflow_engine(flow.nodes, flow.edges, current_user_id)
-        print(f"Workflow execution result: {result}")
+        logger.debug("Workflow execution result: %s", result)
     except Exception as e:
-        print(f"Workflow execution error: {str(e)}")
+        logger.error("Workflow execution error: %s", e)
         result = {"error": f"Workflow execution failed: {str(e)}"}
 
     duration_ms = int((time.time() - start_time) * 1000)
@@ -737,9 +770,9 @@ async def run_workflow(flow_data: dict, current_user_id: str = Depends(get_curre
             current_user_id, flow.workflow_id, nodes_dict, edges_dict, result,
             workflow_name=workflow_name, duration_ms=duration_ms
         )
-        print("✅ Execution history saved")
+        logger.info("✅ Execution history saved")
     except Exception as e:
-        print(f"Warning: Could not save execution history: {str(e)}")
+        logger.warning("Warning: Could not save execution history: %s", e)
 
     # Update user execution count
     try:
@@ -748,7 +781,7 @@ async def run_workflow(flow_data: dict, current_user_id: str = Depends(get_curre
             current_count = user.get("profile", {}).get("execution_count", 0)
             await update_user_stats(current_user_id, {"execution_count": current_count + 1})
     except Exception as e:
-        print(f"Warning: Could not update user stats: {str(e)}")
+        logger.warning("Warning: Could not update user stats: %s", e)
 
     if result.get("error"):
         return {"error": result["error"]}
@@ -756,13 +789,13 @@ async def run_workflow(flow_data: dict, current_user_id: str = Depends(get_curre
 
 
 @app.get("/executions")
-async def get_executions(current_user_id: str = Depends(get_current_user)):
+async def get_executions(current_user_id: str = CurrentUser):
     """Get workflow execution history for the current user"""
     try:
         executions = await get_execution_history(current_user_id)
         return executions
     except Exception as e:
-        print(f"❌ Get executions error: {str(e)}")
+        logger.error("❌ Get executions error: %s", e)
         return []
 
 @app.post("/webhook/register/{workflow_id}")
@@ -830,10 +863,10 @@ async def stop_schedule(workflow_id: str):
             return {"error": f"No scheduled job found with ID: {workflow_id}"}
         
         scheduler.remove_job(workflow_id)
-        print(f"Successfully stopped scheduled workflow: {workflow_id}")
+        logger.info("Successfully stopped scheduled workflow: %s", workflow_id)
         return {"message": f"Scheduled workflow {workflow_id} stopped successfully"}
     except Exception as e:
-        print(f"Error stopping workflow {workflow_id}: {str(e)}")
+        logger.error("Error stopping workflow %s: %s", workflow_id, e)
         return {"error": f"Failed to stop workflow {workflow_id}: {str(e)}"}
 
 @app.get("/schedule/list")
@@ -850,14 +883,14 @@ async def list_scheduled_workflows():
     return {"scheduled_workflows": scheduled_workflows, "count": len(scheduled_workflows)}
 
 @app.post("/upload")
-async def upload_file(file: UploadFile = File(...), current_user_id: str = Depends(get_current_user)):
+async def upload_file(file: UploadFile = File(...), current_user_id: str = CurrentUser):
     """Upload a file to the server"""
     try:
         file_path = os.path.join(UPLOAD_DIR, file.filename)
         with open(file_path, "wb") as buffer:
             shutil.copyfileobj(file.file, buffer)
         
-        print(f"📁 File uploaded by user {current_user_id}: {file.filename}")
+        logger.debug("📁 File uploaded by user %s: %s", current_user_id, file.filename)
         
         return {
             "filename": file.filename,
@@ -869,7 +902,7 @@ async def upload_file(file: UploadFile = File(...), current_user_id: str = Depen
         return {"error": f"Failed to upload file: {str(e)}"}
 
 @app.post("/parse-document")
-async def parse_document(file: UploadFile = File(...), current_user_id: str = Depends(get_current_user)):
+async def parse_document(file: UploadFile = File(...), current_user_id: str = CurrentUser):
     """Parse uploaded document and return structured data"""
     try:
         # Save uploaded file temporarily
@@ -882,7 +915,7 @@ async def parse_document(file: UploadFile = File(...), current_user_id: str = De
         
         result = await run_document_parser_node({"file_path": file_path})
         
-        print(f"📄 Document parsed by user {current_user_id}: {file.filename}")
+        logger.debug("📄 Document parsed by user %s: %s", current_user_id, file.filename)
         
         return {
             "filename": file.filename,
@@ -930,7 +963,7 @@ async def signup(user_data: UserCreate):
             profile=user_doc.get("profile")
         )
         
-        print(f"✅ New user registered: {user_data.email}")
+        logger.info("✅ New user registered: %s", user_data.email)
         
         return {
             "user": user_response,
@@ -940,10 +973,10 @@ async def signup(user_data: UserCreate):
     except ValueError as e:
         return {"error": str(e)}
     except RuntimeError as e:
-        print(f"❌ Database error during signup: {str(e)}")
+        logger.error("❌ Database error during signup: %s", e)
         return {"error": "Database connection error. Please try again later."}
     except Exception as e:
-        print(f"❌ Signup error: {str(e)}")
+        logger.error("❌ Signup error: %s", e)
         return {"error": f"Signup failed: {str(e)}"}
 
 @app.post("/auth/login")
@@ -961,7 +994,7 @@ async def login(user_data: UserLogin):
             return {"error": "Invalid email or password"}
         
         # Verify password
-        if not verify_password(user_data.password, user["password"]):
+        if not await verify_password(user_data.password, user["password"]):
             return {"error": "Invalid email or password"}
         
         # Check if user is active
@@ -972,7 +1005,7 @@ async def login(user_data: UserLogin):
         try:
             await update_last_login(str(user["_id"]))
         except Exception as e:
-            print(f"Warning: Could not update last login: {str(e)}")
+            logger.warning("Warning: Could not update last login: %s", e)
         
         # Create access token
         access_token = create_access_token(data={"sub": str(user["_id"])})
@@ -987,7 +1020,7 @@ async def login(user_data: UserLogin):
             profile=user.get("profile")
         )
         
-        print(f"✅ User logged in: {user_data.email}")
+        logger.info("✅ User logged in: %s", user_data.email)
         
         return {
             "user": user_response,
@@ -995,14 +1028,14 @@ async def login(user_data: UserLogin):
         }
         
     except RuntimeError as e:
-        print(f"❌ Database error during login: {str(e)}")
+        logger.error("❌ Database error during login: %s", e)
         return {"error": "Database connection error. Please try again later."}
     except Exception as e:
-        print(f"❌ Login error: {str(e)}")
+        logger.error("❌ Login error: %s", e)
         return {"error": f"Login failed: {str(e)}"}
 
 @app.get("/auth/me")
-async def get_current_user_info(current_user_id: str = Depends(get_current_user)):
+async def get_current_user_info(current_user_id: str = CurrentUser):
     """Get current user information"""
     try:
         # Check if database is connected
@@ -1027,13 +1060,13 @@ async def get_current_user_info(current_user_id: str = Depends(get_current_user)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Get user error: {str(e)}")
+        logger.error("❌ Get user error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get user information")
 
 @app.put("/auth/profile")
 async def update_profile(
     profile_data: dict,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Update user profile information"""
     try:
@@ -1092,7 +1125,7 @@ async def update_profile(
                 profile=updated_user.get("profile")
             )
             
-            print(f"✅ Profile updated for user: {updated_user['email']}")
+            logger.info("✅ Profile updated for user: %s", updated_user['email'])
             
             return {
                 "message": "Profile updated successfully",
@@ -1104,13 +1137,13 @@ async def update_profile(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Profile update error: {str(e)}")
+        logger.error("❌ Profile update error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update profile: {str(e)}")
 
 @app.put("/auth/password")
 async def change_password(
     password_data: dict,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Change user password"""
     try:
@@ -1128,7 +1161,7 @@ async def change_password(
         if not current_password:
             raise HTTPException(status_code=400, detail="Current password is required")
             
-        if not verify_password(current_password, user["password"]):
+        if not await verify_password(current_password, user["password"]):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
         
         # Check new password
@@ -1137,13 +1170,13 @@ async def change_password(
             raise HTTPException(status_code=400, detail="New password must be at least 6 characters")
             
         # Hash new password
-        hashed_password = hash_password(new_password)
+        hashed_password = await hash_password(new_password)
         
         # Update user password
         success = await update_user(current_user_id, {"password": hashed_password})
         
         if success:
-            print(f"✅ Password updated for user: {user['email']}")
+            logger.info("✅ Password updated for user: %s", user['email'])
             return {"message": "Password updated successfully"}
         else:
             raise HTTPException(status_code=500, detail="Failed to update password")
@@ -1151,7 +1184,7 @@ async def change_password(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Password update error: {str(e)}")
+        logger.error("❌ Password update error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to update password: {str(e)}")
 
 @app.post("/auth/forgot-password")
@@ -1196,7 +1229,7 @@ async def forgot_password(request_data: dict):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Forgot password error: {str(e)}")
+        logger.error("❌ Forgot password error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to process password reset request")
         
 
@@ -1235,7 +1268,7 @@ async def validate_reset_token(token: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Token validation error: {str(e)}")
+        logger.error("❌ Token validation error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to validate reset token")
 
 @app.post("/auth/reset-password")
@@ -1280,7 +1313,7 @@ async def reset_password(reset_data: dict):
             raise HTTPException(status_code=400, detail="Reset token has expired")
         
         # Hash new password
-        hashed_password = hash_password(new_password)
+        hashed_password = await hash_password(new_password)
         
         # Update user password and remove reset token
         update_data = {
@@ -1299,12 +1332,12 @@ async def reset_password(reset_data: dict):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Password reset error: {str(e)}")
+        logger.error("❌ Password reset error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to reset password")
 
 
 @app.post("/api/google/oauth/start")
-async def start_google_oauth(current_user_id: str = Depends(get_current_user)):
+async def start_google_oauth(current_user_id: str = CurrentUser):
     """Generate Google OAuth consent URL for one-click account connection."""
     try:
         credentials_path = _google_oauth_credentials_path()
@@ -1331,7 +1364,7 @@ async def start_google_oauth(current_user_id: str = Depends(get_current_user)):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Google OAuth start error: {str(e)}")
+        logger.error("❌ Google OAuth start error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to start Google OAuth flow")
 
 
@@ -1403,11 +1436,11 @@ async def google_oauth_callback(state: Optional[str] = None, code: Optional[str]
 
         return _redirect("success", "Google account connected successfully")
     except Exception as e:
-        print(f"❌ Google OAuth callback error: {str(e)}")
+        logger.error("❌ Google OAuth callback error: %s", e)
         return _redirect("error", "Google connect failed. Please try again")
 
 @app.get("/api/user/api-keys")
-async def get_user_api_keys(current_user_id: str = Depends(get_current_user)):
+async def get_user_api_keys(current_user_id: str = CurrentUser):
     """Get user's API keys (masked for security)"""
     try:
         user = await get_user_by_id(current_user_id)
@@ -1443,13 +1476,13 @@ async def get_user_api_keys(current_user_id: str = Depends(get_current_user)):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Get API keys error: {str(e)}")
+        logger.error("❌ Get API keys error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get API keys")
 
 @app.put("/api/user/api-keys")
 async def update_user_api_keys(
     api_keys_data: dict,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Update user's API keys"""
     try:
@@ -1501,7 +1534,7 @@ async def update_user_api_keys(
                         "isActive": False
                     }
             
-            print(f"✅ API keys updated for user: {current_user_id}")
+            logger.info("✅ API keys updated for user: %s", current_user_id)
             return {
                 "message": "API keys updated successfully",
                 "apiKeys": masked_keys
@@ -1512,13 +1545,13 @@ async def update_user_api_keys(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Update API keys error: {str(e)}")
+        logger.error("❌ Update API keys error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update API keys")
 
 @app.get("/api/user/api-keys/decrypt/{service}")
 async def get_decrypted_api_key(
     service: str,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Get decrypted API key for internal use (admin/system only)"""
     try:
@@ -1542,14 +1575,14 @@ async def get_decrypted_api_key(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Decrypt API key error: {str(e)}")
+        logger.error("❌ Decrypt API key error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to decrypt API key")
 
 
 @app.get("/api/user/api-keys/decrypt/{service}")
 async def get_decrypted_api_key(
     service: str,
-    current_user_id: str = Depends(get_current_user)
+    current_user_id: str = CurrentUser
 ):
     """Get decrypted API key for internal use (admin/system only)"""
     try:
@@ -1573,7 +1606,7 @@ async def get_decrypted_api_key(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"❌ Decrypt API key error: {str(e)}")
+        logger.error("❌ Decrypt API key error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to decrypt API key")
-        print(f"❌ Decrypt API key error: {str(e)}")
+        logger.error("❌ Decrypt API key error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to decrypt API key")
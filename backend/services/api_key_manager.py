@@ -1,7 +1,10 @@
+import logging
 import os
 import sys
 from typing import Optional, Dict, Any
 
+logger = logging.getLogger(__name__)
+
 # Add the backend directory to Python path for imports
 backend_path = os.path.join(os.path.dirname(__file__), '..')
 if backend_path not in sys.path:
@@ -58,7 +61,7 @@ class UserAPIManager:
                 self._user_data = await get_user_by_id(self.user_id)
             except Exception as e:
                 err_text = str(e)
-                print(f"Error loading user data for {self.user_id}: {err_text}")
+                logger.error("Error loading user data for %s: %s", self.user_id, err_text)
 
                 # Scheduler jobs can run in a different execution context where DB
                 # was not initialized yet. Try to reconnect once, then retry lookup.
@@ -67,10 +70,7 @@ class UserAPIManager:
                         await connect_to_mongo()
                         self._user_data = await get_user_by_id(self.user_id)
                     except Exception as reconnect_error:
-                        print(
-                            f"Error reloading user data after reconnect for {self.user_id}: "
-                            f"{str(reconnect_error)}"
-                        )
+                        logger.error("Error reloading user data after reconnect for %s: %s", self.user_id, reconnect_error)
                         self._user_data = None
                 else:
                     self._user_data = None
@@ -91,7 +91,7 @@ class UserAPIManager:
             
             return None
         except Exception as e:
-            print(f"Error getting API key {key}: {str(e)}")
+            logger.error("Error getting API key %s: %s", key, e)
             return None
     
     async def get_openai_key(self) -> Optional[str]:
@@ -109,7 +109,7 @@ class UserAPIManager:
             
             return os.getenv("OPENAI_API_KEY") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting OpenAI key: {str(e)}")
+            logger.error("Error getting OpenAI key: %s", e)
             return os.getenv("OPENAI_API_KEY") if self._allow_server_fallback() else None
     
     async def get_groq_key(self) -> Optional[str]:
@@ -127,7 +127,7 @@ class UserAPIManager:
             
             return os.getenv("GROQ_API_KEY") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting Groq key: {str(e)}")
+            logger.error("Error getting Groq key: %s", e)
             return os.getenv("GROQ_API_KEY") if self._allow_server_fallback() else None
     
     async def get_stability_key(self) -> Optional[str]:
@@ -145,7 +145,7 @@ class UserAPIManager:
             
             return os.getenv("STABILITY_API_KEY") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting Stability key: {str(e)}")
+            logger.error("Error getting Stability key: %s", e)
             return os.getenv("STABILITY_API_KEY") if self._allow_server_fallback() else None
     
     async def get_discord_webhook(self) -> Optional[str]:
@@ -163,7 +163,7 @@ class UserAPIManager:
             
             return os.getenv("SOCIAL_MEDIA_TEST_WEBHOOK") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting Discord webhook: {str(e)}")
+            logger.error("Error getting Discord webhook: %s", e)
             return os.getenv("SOCIAL_MEDIA_TEST_WEBHOOK") if self._allow_server_fallback() else None
 
     async def get_whatsapp_token(self) -> Optional[str]:
@@ -180,7 +180,7 @@ class UserAPIManager:
 
             return os.getenv("WHATSAPP_ACCESS_TOKEN") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting WhatsApp token: {str(e)}")
+            logger.error("Error getting WhatsApp token: %s", e)
             return os.getenv("WHATSAPP_ACCESS_TOKEN") if self._allow_server_fallback() else None
 
     async def get_whatsapp_phone_number_id(self) -> Optional[str]:
@@ -197,7 +197,7 @@ class UserAPIManager:
 
             return os.getenv("WHATSAPP_PHONE_NUMBER_ID") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting WhatsApp phone number ID: {str(e)}")
+            logger.error("Error getting WhatsApp phone number ID: %s", e)
             return os.getenv("WHATSAPP_PHONE_NUMBER_ID") if self._allow_server_fallback() else None
 
     async def get_gmail_token_json(self) -> Optional[str]:
@@ -214,7 +214,7 @@ class UserAPIManager:
 
             return os.getenv("GMAIL_TOKEN_JSON") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting Gmail token JSON: {str(e)}")
+            logger.error("Error getting Gmail token JSON: %s", e)
             return os.getenv("GMAIL_TOKEN_JSON") if self._allow_server_fallback() else None
 
     async def get_google_token_json(self) -> Optional[str]:
@@ -236,7 +236,7 @@ class UserAPIManager:
 
             return os.getenv("GOOGLE_TOKEN_JSON") if self._allow_server_fallback() else None
         except Exception as e:
-            print(f"Error getting Google token JSON: {str(e)}")
+            logger.error("Error getting Google token JSON: %s", e)
             return os.getenv("GOOGLE_TOKEN_JSON") if self._allow_server_fallback() else None
     
     async def validate_service_keys(self, service: str) -> bool:
@@ -1,3 +1,4 @@
+import logging
 import httpx
 import json
 import re
@@ -6,6 +7,10 @@ import asyncio
 import os
 from typing import Dict, Any, Optional, List
 
+from services.http_session import get_http_session
+
+logger = logging.getLogger(__name__)
+
 async def send_discord_message(webhook_url: str, content: str, embeds: Optional[list] = None, files: Optional[list] = None):
     """Send a message to Discord via webhook"""
     try:
@@ -58,9 +63,9 @@ async def run_discord_node(discord_data: Dict[str, Any]) -> str:
         if not webhook_url:
             return "Error: Discord webhook URL not configured"
         
-        print(f"🎮 Sending Discord message to webhook")
-        print(f"📝 Message: {message[:100]}..." if message else "📝 Message: (embeds only)")
-        print(f"🔗 Webhook: {webhook_url[:50]}...")
+        logger.debug("🎮 Sending Discord message to webhook")
+        logger.debug("📝 Message: %.100s...", message or "(embeds only)")
+        logger.debug("🔗 Webhook: %s...", webhook_url[:50])
         
         # Prepare payload
         payload = {
@@ -75,33 +80,32 @@ async def run_discord_node(discord_data: Dict[str, Any]) -> str:
         # Add embeds if provided
         if embeds:
             payload["embeds"] = embeds[:10]  # Discord limit is 10 embeds
-            print(f"📊 Sending {len(embeds)} embed(s)")
+            logger.debug("📊 Sending %s embed(s)", len(embeds))
         
         # If no message and no embeds, send default message
         if not message and not embeds:
             payload["content"] = "🤖 AutoFlow workflow completed successfully!"
         
-        # Use aiohttp for async request with timeout
+        # Use the shared aiohttp session with a per-request timeout
         timeout = aiohttp.ClientTimeout(total=10)
         
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.post(webhook_url, json=payload) as response:
-                if response.status == 204:
-                    print("✅ Discord message sent successfully!")
-                    return "Discord message sent successfully"
-                else:
-                    error_text = await response.text()
-                    print(f"❌ Discord webhook failed: {response.status} - {error_text}")
-                    return f"Discord webhook failed: {response.status}"
+        async with get_http_session().post(webhook_url, json=payload, timeout=timeout) as response:
+            if response.status == 204:
+                logger.info("✅ Discord message sent successfully!")
+                return "Discord message sent successfully"
+            else:
+                error_text = await response.text()
+                logger.error("❌ Discord webhook failed: %s - %s", response.status, error_text)
+                return f"Discord webhook failed: {response.status}"
     
     except asyncio.TimeoutError:
-        print(f"❌ Discord webhook timeout")
+        logger.error("❌ Discord webhook timeout")
         return "Discord webhook timeout: Request timed out after 10 seconds"
     except aiohttp.ClientError as e:
-        print(f"❌ Discord client error: {str(e)}")
+        logger.error("❌ Discord client error: %s", e)
         return f"Discord client error: {str(e)}"
     except Exception as e:
-        print(f"❌ Discord webhook failed: {str(e)}")
+        logger.error("❌ Discord webhook failed: %s", e)
         return f"Discord webhook failed: {str(e)}"
 
 def validate_discord_webhook(webhook_url: str) -> bool:
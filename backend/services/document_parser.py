@@ -1,8 +1,20 @@
+import asyncio
+import hashlib
+import logging
 import os
 import json
+from collections import OrderedDict
 from typing import Dict, Any, List
 from datetime import datetime   
 import mimetypes
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # Pandas for Excel parsing
 try:
@@ -52,9 +64,71 @@ import json as json_lib
 BASE_DIR = "/tmp"
 PARSED_DIR = os.path.join(BASE_DIR, "parsed_documents")
 
+# Leading slice of the text stored alongside it, so consumers that only show an
+# excerpt do not have to keep the full content in memory
+CONTENT_PREVIEW_CHARS = 5000
+
+def _dump_parsed(result: Dict[str, Any], output_path: str) -> None:
+    """Write parsed data as indented UTF-8 JSON, with orjson when available."""
+    if orjson is not None:
+        try:
+            data = orjson.dumps(
+                result,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            )
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; the stdlib encoder handles them
+        else:
+            with open(output_path, 'wb') as f:
+                f.write(data)
+            return
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+
 # Create output directory for parsed documents
 os.makedirs(PARSED_DIR, exist_ok=True)
 
+# Parsed output path per (content hash, extension, file name), so the same file
+# uploaded or parsed again reuses the earlier output instead of being parsed again.
+# The file name is part of the key because some fallback texts quote it. A hit is
+# written to a new output file for the caller, since callers may delete their output.
+PARSE_CACHE_MAX_SIZE = 128
+_parse_cache: "OrderedDict[tuple, str]" = OrderedDict()
+
+
+def _output_path(file_path: str) -> str:
+    """A fresh parsed-output path for ``file_path``; never shared between calls."""
+    base_filename = os.path.splitext(os.path.basename(file_path))[0]
+    output_filename = f"parsed_{base_filename}_{int(datetime.now().timestamp())}_{uuid.uuid4().hex[:8]}.json"
+    return os.path.join(PARSED_DIR, output_filename)
+
+
+def _copy_parsed(cached_path: str, file_path: str) -> str:
+    """Copy an earlier parse output for ``file_path`` and return the new path."""
+    with open(cached_path, 'rb') as f:
+        raw = f.read()
+    try:
+        result = orjson.loads(raw) if orjson is not None else json_lib.loads(raw)
+    except ValueError:
+        result = json_lib.loads(raw)  # NaN/Infinity are only accepted by the stdlib parser
+    
+    metadata = result.get("metadata")
+    if isinstance(metadata, dict):
+        metadata["file_name"] = os.path.basename(file_path)
+    
+    output_path = _output_path(file_path)
+    _dump_parsed(result, output_path)
+    return output_path
+
+
+def _file_digest(file_path: str) -> str:
+    sha1 = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
 async def parse_pdf(file_path: str) -> Dict[str, Any]:
     """Parse PDF file and extract text using multiple methods"""
     # Try PyMuPDF first (better text extraction)
@@ -110,7 +184,7 @@ To extract text from this document, you may need to:
                 }
             }
         except Exception as e:
-            print(f"⚠️ PyMuPDF failed: {str(e)}, trying PyPDF2...")
+            logger.warning("⚠️ PyMuPDF failed: %s, trying PyPDF2...", e)
 
     # Fallback to PyPDF2 with similar enhancements
     if not PDF_AVAILABLE:
@@ -132,7 +206,7 @@ To extract text from this document, you may need to:
                     })
                     full_text += page_text + "\n"
                 except Exception as page_error:
-                    print(f"⚠️ Error extracting page {page_num + 1}: {str(page_error)}")
+                    logger.warning("⚠️ Error extracting page %s: %s", page_num + 1, page_error)
                     pages.append({
                         "page_number": page_num + 1,
                         "content": f"Error extracting text from page {page_num + 1}",
@@ -309,7 +383,7 @@ async def parse_excel(file_path: str) -> Dict[str, Any]:
                 }
             }
         except Exception as e:
-            print(f"⚠️ Pandas Excel parsing failed: {str(e)}, trying openpyxl...")
+            logger.warning("⚠️ Pandas Excel parsing failed: %s, trying openpyxl...", e)
     
     # Fallback to openpyxl
     if EXCEL_AVAILABLE:
@@ -428,8 +502,12 @@ async def parse_csv(file_path: str) -> Dict[str, Any]:
 async def parse_json(file_path: str) -> Dict[str, Any]:
     """Parse JSON file"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            json_data = json_lib.load(file)
+        with open(file_path, 'rb') as file:
+            raw = file.read()
+        try:
+            json_data = orjson.loads(raw) if orjson is not None else json_lib.loads(raw)
+        except ValueError:
+            json_data = json_lib.loads(raw)  # NaN/Infinity are only accepted by the stdlib parser
         
         # Analyze JSON structure
         def analyze_json_structure(obj, depth=0, max_depth=3):
@@ -527,9 +605,26 @@ async def run_document_parser_node(node_data: Dict[str, Any]) -> str:
         mime_type, _ = mimetypes.guess_type(file_path)
         file_ext = os.path.splitext(file_path)[1].lower()
         
-        print(f"📄 Parsing document: {os.path.basename(file_path)}")
-        print(f"📋 File type: {file_ext}, MIME: {mime_type}")
-        print(f"📊 File size: {os.path.getsize(file_path) / 1024:.1f} KB")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "📄 Parsing document: %s (type: %s, MIME: %s, %.1f KB)",
+                os.path.basename(file_path), file_ext, mime_type, os.path.getsize(file_path) / 1024,
+            )
+        
+        # Reuse the output of an earlier parse of identical content while it exists
+        cache_key = (await asyncio.to_thread(_file_digest, file_path), file_ext, os.path.basename(file_path))
+        cached_path = _parse_cache.get(cache_key)
+        if cached_path is not None:
+            try:
+                output_path = await asyncio.to_thread(_copy_parsed, cached_path, file_path)
+            except (OSError, ValueError):
+                # The earlier output was removed (or is being removed); parse again
+                _parse_cache.pop(cache_key, None)
+            else:
+                if cache_key in _parse_cache:
+                    _parse_cache.move_to_end(cache_key)
+                logger.debug("♻️ Reusing parsed output of %s: %s", cached_path, output_path)
+                return f"Document parsed: {output_path}"
         
         # Route to appropriate parser
         if file_ext == '.pdf':
@@ -552,41 +647,60 @@ async def run_document_parser_node(node_data: Dict[str, Any]) -> str:
             return f"Error: Unsupported file type: {file_ext}. Supported types: PDF, DOCX, XLSX, CSV, JSON, TXT, MD"
         
         if "error" in result:
-            print(f"❌ Parse error: {result['error']}")
+            logger.error("❌ Parse error: %s", result['error'])
             return result["error"]
         
+        content = result.get("content")
+        if isinstance(content, str):
+            result["content_preview"] = content[:CONTENT_PREVIEW_CHARS]
+            result["content_length"] = len(content)
+        
         # Save parsed data to JSON file for downstream nodes
-        base_filename = os.path.splitext(os.path.basename(file_path))[0]
-        output_filename = f"parsed_{base_filename}_{int(datetime.now().timestamp())}.json"
-        output_path = os.path.join(PARSED_DIR, output_filename)
+        output_path = _output_path(file_path)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+        _dump_parsed(result, output_path)
+        
+        _parse_cache[cache_key] = output_path
+        if len(_parse_cache) > PARSE_CACHE_MAX_SIZE:
+            _parse_cache.popitem(last=False)
         
         # Create summary
         doc_type = result.get("type", "unknown")
         metadata = result.get("metadata", {})
         
-        print(f"✅ Document parsed successfully!")
-        print(f"📁 Type: {doc_type.upper()}")
-        print(f"📏 Content length: {len(result.get('content', ''))} characters")
-        print(f"💾 JSON saved to: {output_path}")
+        logger.info("✅ Document parsed successfully!")
+        logger.debug("📁 Type: %s", doc_type.upper())
+        logger.debug("📏 Content length: %s characters", len(result.get('content', '')))
+        logger.debug("💾 JSON saved to: %s", output_path)
         
         # Enhanced summary based on document type
         if doc_type == "pdf":
-            print(f"📖 Pages: {result.get('total_pages', 0)}")
+            logger.debug("📖 Pages: %s", result.get('total_pages', 0))
         elif doc_type == "excel":
-            print(f"📊 Sheets: {len(result.get('sheet_names', []))}")
+            logger.debug("📊 Sheets: %s", len(result.get('sheet_names', [])))
         elif doc_type == "docx":
-            print(f"📝 Paragraphs: {metadata.get('paragraph_count', 0)}, Tables: {metadata.get('table_count', 0)}")
+            logger.debug("📝 Paragraphs: %s, Tables: %s", metadata.get('paragraph_count', 0), metadata.get('table_count', 0))
         
         return f"Document parsed: {output_path}"
         
     except Exception as e:
         error_msg = f"Document parsing failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
+def sheet_rows(sheet: Dict[str, Any]) -> List[List[str]]:
+    """Header row plus string cells for one parsed Excel sheet.
+
+    With pandas available the cells are cast in bulk instead of per cell.
+    """
+    columns = sheet.get("columns", [])
+    records = sheet.get("data", [])
+    if PANDAS_AVAILABLE and records:
+        # object dtype keeps each cell's own str() instead of an inferred numeric one
+        df = pd.DataFrame(records, columns=columns, dtype=object).fillna("").astype(str)
+        return [columns, *df.to_numpy().tolist()]
+    return [columns, *([str(row.get(col, "")) for col in columns] for row in records)]
+
 # Helper function to get parsing capabilities
 def get_parsing_capabilities():
     """Return available parsing capabilities"""
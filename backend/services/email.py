@@ -1,3 +1,4 @@
+import logging
 import smtplib
 import os
 from email.mime.text import MIMEText
@@ -7,12 +8,20 @@ from email.mime.application import MIMEApplication
 from email.mime.base import MIMEBase
 from email import encoders
 import mimetypes
+import re
 import socket
 import ssl
 import json
 from typing import List, Dict, Any, Optional
 import asyncio
 
+from services.http_session import get_http_session
+
+logger = logging.getLogger(__name__)
+
+# Bodies with any of these markers are sent as HTML; one scan, no lowercased copy
+_HTML_BODY_RE = re.compile(r"<html>|<p>|\*\*", re.IGNORECASE)
+
 
 def _is_truthy(value: Optional[str]) -> bool:
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
@@ -34,11 +43,11 @@ async def run_email_node(email_data):
         email_user = os.getenv("EMAIL_USER")
         email_password = os.getenv("EMAIL_PASSWORD")
         
-        print(f"📧 Email Configuration Check:")
-        print(f"   SMTP Server: {smtp_server}")
-        print(f"   SMTP Port: {smtp_port}")
-        print(f"   Email User: {email_user[:10]}..." if email_user else "   Email User: Not configured")
-        print(f"   Password: {'*' * len(email_password) if email_password else 'Not configured'}")
+        logger.debug("📧 Email Configuration Check:")
+        logger.debug("   SMTP Server: %s", smtp_server)
+        logger.debug("   SMTP Port: %s", smtp_port)
+        logger.debug("   Email User: %.10s...", email_user or "Not configured")
+        logger.debug("   Password: %s", "configured" if email_password else "Not configured")
 
         strict_mode = _require_user_owned_keys()
         user_google_token_json = email_data.get("google_token_json") or email_data.get("gmail_token_json")
@@ -82,16 +91,16 @@ async def run_email_node(email_data):
                 elif attachment.get("type") == "url" and attachment.get("url"):
                     body += f"{i}. {attachment.get('name', 'File')}: {attachment.get('url', '')}\n"
         
-        print(f"📧 Email details:")
-        print(f"   From: {email_user}")
-        print(f"   To: {to_email}")
+        logger.debug("📧 Email details:")
+        logger.debug("   From: %s", email_user)
+        logger.debug("   To: %s", to_email)
         if cc_email:
-            print(f"   CC: {cc_email}")
+            logger.debug("   CC: %s", cc_email)
         if bcc_email:
-            print(f"   BCC: {bcc_email}")
-        print(f"   Subject: {subject}")
-        print(f"   Body length: {len(body)} characters")
-        print(f"   Attachments: {len(attachments)}")
+            logger.debug("   BCC: %s", bcc_email)
+        logger.debug("   Subject: %s", subject)
+        logger.debug("   Body length: %s characters", len(body))
+        logger.debug("   Attachments: %s", len(attachments))
         
         # Create message
         message = MIMEMultipart()
@@ -106,7 +115,7 @@ async def run_email_node(email_data):
             message["Bcc"] = bcc_email
         
         # Add body with HTML support for better AI content formatting
-        if "<html>" in body.lower() or "<p>" in body.lower() or "**" in body:
+        if _HTML_BODY_RE.search(body):
             # Format the body for HTML if it contains AI content
             html_body = body
             
@@ -152,7 +161,7 @@ async def run_email_node(email_data):
                         # Determine MIME type
                         mime_type, _ = mimetypes.guess_type(file_path)
                         
-                        print(f"📎 Processing attachment: {file_name}")
+                        logger.debug("📎 Processing attachment: %s", file_name)
                         
                         if file_ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']:
                             try:
@@ -169,9 +178,9 @@ async def run_email_node(email_data):
                                 image.add_header("Content-Disposition", f"attachment; filename={file_name}")
                                 message.attach(image)
                                 attachment_count += 1
-                                print(f"✅ Successfully attached image: {file_name}")
+                                logger.info("✅ Successfully attached image: %s", file_name)
                             except Exception as img_error:
-                                print(f"❌ Failed to attach image {file_name}: {str(img_error)}")
+                                logger.error("❌ Failed to attach image %s: %s", file_name, img_error)
                                 continue
                         
                         elif file_ext in ['.pdf', '.docx', '.xlsx', '.json', '.txt', '.csv']:
@@ -189,16 +198,16 @@ async def run_email_node(email_data):
                                 part.add_header("Content-Disposition", f"attachment; filename={file_name}")
                                 message.attach(part)
                                 attachment_count += 1
-                                print(f"📎 Attached document: {file_name}")
+                                logger.debug("📎 Attached document: %s", file_name)
                             except Exception as doc_error:
-                                print(f"❌ Failed to attach document {file_name}: {str(doc_error)}")
+                                logger.error("❌ Failed to attach document %s: %s", file_name, doc_error)
                                 continue
                         
                     else:
-                        print(f"⚠️ Attachment file not found: {file_path}")
+                        logger.warning("⚠️ Attachment file not found: %s", file_path)
                         
             except Exception as e:
-                print(f"⚠️ Failed to process attachment: {str(e)}")
+                logger.warning("⚠️ Failed to process attachment: %s", e)
                 continue
         
         # Prepare recipient list for SMTP
@@ -260,18 +269,18 @@ async def run_email_node(email_data):
                     gcreds = None
 
             if gcreds and gcreds.valid:
-                print("📤 Sending via Gmail API...")
+                logger.debug("📤 Sending via Gmail API...")
                 service = build('gmail', 'v1', credentials=gcreds)
                 raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
                 result = service.users().messages().send(
                     userId='me', body={'raw': raw}
                 ).execute()
-                print(f"✅ Email sent via Gmail API! ID: {result.get('id')}")
+                logger.info("✅ Email sent via Gmail API! ID: %s", result.get('id'))
                 return _success_msg("Gmail API")
             else:
-                print("⚠️ Google token unavailable or invalid — skipping Gmail API")
+                logger.warning("⚠️ Google token unavailable or invalid — skipping Gmail API")
         except Exception as e:
-            print(f"⚠️ Gmail API unavailable: {e}")
+            logger.warning("⚠️ Gmail API unavailable: %s", e)
 
         if strict_mode:
             return "Error: Unable to send via user Gmail token. Reconnect Google account and grant gmail.send scope."
@@ -279,7 +288,7 @@ async def run_email_node(email_data):
         # ── 2. Resend (works if to == account owner email, or domain verified) ─
         resend_key = os.getenv("RESEND_API_KEY")
         if resend_key:
-            print("📤 Sending via Resend API...")
+            logger.debug("📤 Sending via Resend API...")
             try:
                 resend_payload = {
                     "from": "AutoFlow <onboarding@resend.dev>",
@@ -292,26 +301,25 @@ async def run_email_node(email_data):
                 if bcc_email:
                     resend_payload["bcc"] = [bcc_email]
 
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://api.resend.com/emails",
-                        json=resend_payload,
-                        headers={"Authorization": f"Bearer {resend_key}",
-                                 "Content-Type": "application/json"},
-                        timeout=aiohttp.ClientTimeout(total=30)
-                    ) as resp:
-                        resp_json = await resp.json()
-                        if resp.status in (200, 201):
-                            print("✅ Email sent via Resend!")
-                            return _success_msg("Resend")
-                        else:
-                            err = resp_json.get("message", str(resp_json))
-                            print(f"❌ Resend error {resp.status}: {err}")
+                async with get_http_session().post(
+                    "https://api.resend.com/emails",
+                    json=resend_payload,
+                    headers={"Authorization": f"Bearer {resend_key}",
+                             "Content-Type": "application/json"},
+                    timeout=aiohttp.ClientTimeout(total=30)
+                ) as resp:
+                    resp_json = await resp.json()
+                    if resp.status in (200, 201):
+                        logger.info("✅ Email sent via Resend!")
+                        return _success_msg("Resend")
+                    else:
+                        err = resp_json.get("message", str(resp_json))
+                        logger.error("❌ Resend error %s: %s", resp.status, err)
             except Exception as e:
-                print(f"❌ Resend exception: {e}")
+                logger.error("❌ Resend exception: %s", e)
 
         # ── 3. SMTP fallback (local dev) ──────────────────────────────────────
-        print("🔌 Connecting via SMTP...")
+        logger.debug("🔌 Connecting via SMTP...")
         if not email_user or not email_password:
             return "Error: Email credentials not configured. Please set EMAIL_USER and EMAIL_PASSWORD environment variables"
         try:
@@ -323,7 +331,7 @@ async def run_email_node(email_data):
                 server.starttls(context=context)
                 server.login(email_user, email_password)
                 server.send_message(message, to_addrs=recipients)
-                print("✅ Email sent via SMTP!")
+                logger.info("✅ Email sent via SMTP!")
                 return _success_msg("SMTP")
 
         except smtplib.SMTPAuthenticationError as e:
@@ -346,7 +354,7 @@ async def run_email_node(email_data):
         
     except Exception as e:
         error_msg = f"Email failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
 # Helper function to validate email format
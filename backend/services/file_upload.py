@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import os
 import io
 import time
@@ -10,6 +12,13 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 
+logger = logging.getLogger(__name__)
+
+# Files above this size are sent with Drive's resumable protocol in chunks
+# instead of a single request holding the whole body
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # must be a multiple of 256 KB
+
 
 def _backend_root() -> str:
     return os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -38,14 +47,14 @@ def _load_drive_credentials(scopes, token_json=None):
         token_data = json.loads(token_json) if isinstance(token_json, str) else token_json
         creds = Credentials.from_authorized_user_info(token_data, scopes)
     elif os.path.exists(token_file):
-        print("🔑 Loading existing Drive token...")
+        logger.debug("🔑 Loading existing Drive token...")
         creds = Credentials.from_authorized_user_file(token_file, scopes)
 
     if creds and not creds.valid:
         if creds.expired and creds.refresh_token:
-            print("🔄 Refreshing expired token...")
+            logger.debug("🔄 Refreshing expired token...")
             creds.refresh(Request())
-            print("✅ Token refreshed successfully")
+            logger.info("✅ Token refreshed successfully")
             if not token_json:
                 with open(token_file, 'w') as token:
                     token.write(creds.to_json())
@@ -56,7 +65,7 @@ def _load_drive_credentials(scopes, token_json=None):
         if token_json or not _allow_server_fallback():
             raise Exception("Missing/invalid user Google token. Add google_token_json in Settings > API Keys.")
 
-        print("🚀 Starting new OAuth flow...")
+        logger.debug("🚀 Starting new OAuth flow...")
         if not os.path.exists(credentials_file):
             raise FileNotFoundError(
                 "credentials.json file not found. Please download it from Google Cloud Console and make sure Google Drive API is enabled."
@@ -64,10 +73,10 @@ def _load_drive_credentials(scopes, token_json=None):
 
         flow = InstalledAppFlow.from_client_secrets_file(credentials_file, scopes)
         creds = flow.run_local_server(port=0)
-        print("✅ OAuth flow completed successfully")
+        logger.info("✅ OAuth flow completed successfully")
         with open(token_file, 'w') as token:
             token.write(creds.to_json())
-            print("💾 Token saved successfully")
+            logger.debug("💾 Token saved successfully")
 
     return creds
 
@@ -80,22 +89,37 @@ def _drive_paths():
         "downloads": os.path.join(root, "downloads"),
     }
 
+def _execute_upload(request, resumable: bool) -> dict:
+    """Run a Drive create request, chunk by chunk when it is resumable."""
+    if not resumable:
+        return request.execute()
+    
+    response = None
+    while response is None:
+        status, response = request.next_chunk()
+        if status:
+            logger.debug("☁️ Upload progress: %d%%", int(status.progress() * 100))
+    return response
+
+
 async def upload_to_drive(file_path, file_name, mime_type, token_json=None):
-    # Validate file exists
-    if not os.path.exists(file_path):
+    # Validate file exists; one stat also gives the size logged below
+    try:
+        local_size = os.stat(file_path).st_size
+    except FileNotFoundError:
         raise FileNotFoundError(f"File not found: {file_path}")
     
     try:
         # Use Google Drive specific scopes
         SCOPES = ['https://www.googleapis.com/auth/drive.file']
         
-        print(f"📁 Attempting to upload file: {file_path}")
-        print(f"📝 File name: {file_name}, MIME type: {mime_type}")
-        print(f"📊 File size: {os.path.getsize(file_path) / 1024:.1f} KB")
+        logger.debug("📁 Attempting to upload file: %s", file_path)
+        logger.debug("📝 File name: %s, MIME type: %s", file_name, mime_type)
+        logger.debug("📊 File size: %.1f KB", local_size / 1024)
         
         creds = _load_drive_credentials(SCOPES, token_json=token_json)
         
-        print("🔧 Building Drive service...")
+        logger.debug("🔧 Building Drive service...")
         service = build('drive', 'v3', credentials=creds)
 
         # Set file metadata with better naming
@@ -113,26 +137,33 @@ async def upload_to_drive(file_path, file_name, mime_type, token_json=None):
             if not mime_type:
                 mime_type = 'application/octet-stream'
         
-        media = MediaFileUpload(file_path, mimetype=mime_type)
+        resumable = local_size > RESUMABLE_UPLOAD_THRESHOLD
+        if resumable:
+            media = MediaFileUpload(file_path, mimetype=mime_type, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+        else:
+            media = MediaFileUpload(file_path, mimetype=mime_type)
 
-        print("☁️ Uploading file to Google Drive...")
-        file = service.files().create(
+        logger.debug("☁️ Uploading file to Google Drive...")
+        request = service.files().create(
             body=file_metadata,
             media_body=media,
             fields='id, webViewLink, webContentLink, mimeType, size'
-        ).execute()
+        )
+        # The client library is blocking; keep the transfer off the event loop
+        file = await asyncio.to_thread(_execute_upload, request, resumable)
         
         file_id = file.get('id')
         file_url = file.get('webViewLink')
         file_size = file.get('size', 0)
         
-        print(f"✅ File uploaded successfully!")
-        print(f"📁 File ID: {file_id}")
-        print(f"🔗 View URL: {file_url}")
-        print(f"📊 Size: {int(file_size) / 1024:.1f} KB" if file_size else "Size: Unknown")
+        logger.info("✅ File uploaded successfully!")
+        logger.debug("📁 File ID: %s", file_id)
+        logger.debug("🔗 View URL: %s", file_url)
+        if file_size:
+            logger.debug("📊 Size: %.1f KB", int(file_size) / 1024)
 
         # Keep local file for potential document parsing workflows
-        print("📂 Local file kept for potential document parsing")
+        logger.debug("📂 Local file kept for potential document parsing")
 
         return {
             "file_id": file_id,
@@ -144,12 +175,12 @@ async def upload_to_drive(file_path, file_name, mime_type, token_json=None):
     
     except FileNotFoundError as e:
         error_msg = f"File not found: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         raise Exception(error_msg)
     except Exception as e:
         error_msg = f"Google Drive upload failed: {str(e)}"
-        print(f"❌ {error_msg}")
-        print(f"🔍 Error type: {type(e)}")
+        logger.error("❌ %s", error_msg)
+        logger.debug("🔍 Error type: %s", type(e))
         raise Exception(error_msg)
 
 
@@ -160,16 +191,16 @@ async def download_from_drive(file_id: str, custom_filename: str = None, token_j
         SCOPES = ['https://www.googleapis.com/auth/drive.file']
         drive_paths = _drive_paths()
         
-        print(f"📥 Starting enhanced download for file ID: {file_id}")
+        logger.debug("📥 Starting enhanced download for file ID: %s", file_id)
         
         creds = _load_drive_credentials(SCOPES, token_json=token_json)
         
-        print("🔧 Building Drive service...")
+        logger.debug("🔧 Building Drive service...")
         service = build('drive', 'v3', credentials=creds)
         
         # Get file metadata first
         try:
-            print("📋 Fetching file metadata...")
+            logger.debug("📋 Fetching file metadata...")
             file_metadata = service.files().get(
                 fileId=file_id, 
                 fields='name,mimeType,size,createdTime,modifiedTime,owners'
@@ -182,18 +213,18 @@ async def download_from_drive(file_id: str, custom_filename: str = None, token_j
             created_time = file_metadata.get('createdTime')
             owners = file_metadata.get('owners', [])
             
-            print(f"📄 File Details:")
-            print(f"   Name: {original_name}")
-            print(f"   Type: {mime_type}")
-            print(f"   Size: {file_size} bytes" if file_size else "   Size: Unknown")
-            print(f"   Created: {created_time}")
-            print(f"   Owner: {owners[0].get('displayName', 'Unknown') if owners else 'Unknown'}")
+            logger.debug("📄 File Details:")
+            logger.debug("   Name: %s", original_name)
+            logger.debug("   Type: %s", mime_type)
+            logger.debug("%s", f"   Size: {file_size} bytes" if file_size else "   Size: Unknown")
+            logger.debug("   Created: %s", created_time)
+            logger.debug("   Owner: %s", owners[0].get('displayName', 'Unknown') if owners else 'Unknown')
             
         except Exception as e:
-            print(f"⚠️ Error getting file metadata: {str(e)}")
+            logger.warning("⚠️ Error getting file metadata: %s", e)
             file_name = custom_filename or f'downloaded_{file_id}'
             mime_type = None
-            print(f"📄 Using fallback filename: {file_name}")
+            logger.debug("📄 Using fallback filename: %s", file_name)
         
         # Store downloads under backend/downloads for stable local/cloud behavior.
         downloads_dir = drive_paths["downloads"]
@@ -209,21 +240,20 @@ async def download_from_drive(file_id: str, custom_filename: str = None, token_j
         
         # Handle potential filename conflicts
         counter = 1
-        original_path = local_path
+        name, ext = os.path.splitext(local_path)
         while os.path.exists(local_path):
-            name, ext = os.path.splitext(original_path)
             local_path = f"{name}_{counter}{ext}"
             counter += 1
         
-        print(f"📂 Download destination: {local_path}")
+        logger.debug("📂 Download destination: %s", local_path)
         
         # Handle Google Workspace files (need export)
         if mime_type and 'google-apps' in mime_type:
-            print("🔄 Detected Google Workspace file - using export method")
+            logger.debug("🔄 Detected Google Workspace file - using export method")
             local_path = await _export_google_workspace_file(service, file_id, safe_filename, mime_type, timestamp_dir)
         else:
             # Regular file download
-            print("📥 Starting regular file download...")
+            logger.debug("📥 Starting regular file download...")
             request = service.files().get_media(fileId=file_id)
             
             # Download with progress tracking
@@ -239,20 +269,24 @@ async def download_from_drive(file_id: str, custom_filename: str = None, token_j
                         progress = int(status.progress() * 100)
                         if total_size > 0:
                             downloaded = int(status.progress() * total_size)
-                            print(f"📥 Download progress: {progress}% ({downloaded / 1024:.1f} KB / {total_size / 1024:.1f} KB)")
+                            logger.debug("📥 Download progress: %s%% (%.1f KB / %.1f KB)", progress, downloaded / 1024, total_size / 1024)
                         else:
-                            print(f"📥 Download progress: {progress}%")
+                            logger.debug("📥 Download progress: %s%%", progress)
         
         # Verify download
-        if os.path.exists(local_path):
-            actual_size = os.path.getsize(local_path)
-            print(f"✅ Download completed successfully!")
-            print(f"📁 Local file: {local_path}")
-            print(f"📊 File size: {actual_size / 1024:.1f} KB")
+        try:
+            actual_size = os.stat(local_path).st_size
+        except FileNotFoundError:
+            actual_size = None
+        
+        if actual_size is not None:
+            logger.info("✅ Download completed successfully!")
+            logger.debug("📁 Local file: %s", local_path)
+            logger.debug("📊 File size: %.1f KB", actual_size / 1024)
             
             # Verify file integrity if possible
             if file_size and int(file_size) != actual_size:
-                print(f"⚠️ Warning: File size mismatch! Expected: {file_size}, Got: {actual_size}")
+                logger.warning("⚠️ Warning: File size mismatch! Expected: %s, Got: %s", file_size, actual_size)
             
             return local_path
         else:
@@ -260,13 +294,13 @@ async def download_from_drive(file_id: str, custom_filename: str = None, token_j
         
     except Exception as e:
         error_msg = f"Enhanced download from Drive failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return None
 
 async def _export_google_workspace_file(service, file_id: str, file_name: str, mime_type: str, download_dir: str) -> str:
     """Export Google Workspace files to downloadable formats with enhanced error handling."""
     try:
-        print(f"🔄 Exporting Google Workspace file: {mime_type}")
+        logger.debug("🔄 Exporting Google Workspace file: %s", mime_type)
         
         # Define export formats with fallbacks
         export_formats = {
@@ -317,7 +351,7 @@ async def _export_google_workspace_file(service, file_id: str, file_name: str, m
         local_path = os.path.join(download_dir, file_name)
         
         try:
-            print(f"📤 Attempting export to {export_mime}")
+            logger.debug("📤 Attempting export to %s", export_mime)
             request = service.files().export_media(fileId=file_id, mimeType=export_mime)
             
             with open(local_path, 'wb') as local_file:
@@ -327,13 +361,13 @@ async def _export_google_workspace_file(service, file_id: str, file_name: str, m
                     status, done = downloader.next_chunk()
                     if status:
                         progress = int(status.progress() * 100)
-                        print(f"📤 Export progress: {progress}%")
+                        logger.debug("📤 Export progress: %s%%", progress)
             
-            print(f"✅ Successfully exported to {export_mime}")
+            logger.info("✅ Successfully exported to %s", export_mime)
             
         except Exception as primary_error:
-            print(f"⚠️ Primary export failed: {str(primary_error)}")
-            print(f"🔄 Trying fallback format: {format_info['fallback']}")
+            logger.warning("⚠️ Primary export failed: %s", primary_error)
+            logger.debug("🔄 Trying fallback format: %s", format_info['fallback'])
             
             # Try fallback format
             export_mime = format_info['fallback']
@@ -352,14 +386,14 @@ async def _export_google_workspace_file(service, file_id: str, file_name: str, m
                     status, done = downloader.next_chunk()
                     if status:
                         progress = int(status.progress() * 100)
-                        print(f"📤 Fallback export progress: {progress}%")
+                        logger.debug("📤 Fallback export progress: %s%%", progress)
             
-            print(f"✅ Successfully exported to fallback format: {export_mime}")
+            logger.info("✅ Successfully exported to fallback format: %s", export_mime)
         
         return local_path
         
     except Exception as e:
-        print(f"❌ Google Workspace export failed: {str(e)}")
+        logger.error("❌ Google Workspace export failed: %s", e)
         raise Exception(f"Failed to export Google Workspace file: {str(e)}")
 
 async def get_drive_file_info(file_id: str, token_json=None) -> dict:
@@ -425,7 +459,7 @@ async def cleanup_old_downloads(days_old: int = 7) -> dict:
                     os.remove(file_path)
                     deleted_files += 1
                     total_size_freed += file_size
-                    print(f"🗑️ Deleted old file: {file}")
+                    logger.debug("🗑️ Deleted old file: %s", file)
         
         # Remove empty directories
         for root, dirs, files in os.walk(downloads_dir, topdown=False):
@@ -434,7 +468,7 @@ async def cleanup_old_downloads(days_old: int = 7) -> dict:
                 try:
                     if not os.listdir(dir_path):  # Directory is empty
                         os.rmdir(dir_path)
-                        print(f"🗑️ Removed empty directory: {dir}")
+                        logger.debug("🗑️ Removed empty directory: %s", dir)
                 except OSError:
                     pass  # Directory not empty or other error
         
@@ -1,3 +1,4 @@
+import logging
 import json
 import os
 from typing import Any, Dict, Optional
@@ -6,6 +7,8 @@ from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
+logger = logging.getLogger(__name__)
+
 
 def _load_credentials(token_json: Optional[str]) -> Optional[Credentials]:
     """Load Gmail credentials from user token JSON or fallback token file."""
@@ -18,7 +21,7 @@ def _load_credentials(token_json: Optional[str]) -> Optional[Credentials]:
             token_data = json.loads(token_json) if isinstance(token_json, str) else token_json
             creds = Credentials.from_authorized_user_info(token_data, scopes=scopes)
         except Exception as e:
-            print(f"Gmail trigger: invalid user token JSON: {str(e)}")
+            logger.warning("Gmail trigger: invalid user token JSON: %s", e)
 
     if not creds:
         backend_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -27,7 +30,7 @@ def _load_credentials(token_json: Optional[str]) -> Optional[Credentials]:
             try:
                 creds = Credentials.from_authorized_user_file(token_file, scopes=scopes)
             except Exception as e:
-                print(f"Gmail trigger: failed reading fallback token file: {str(e)}")
+                logger.warning("Gmail trigger: failed reading fallback token file: %s", e)
 
     if creds and not creds.valid:
         if creds.expired and creds.refresh_token:
@@ -36,7 +39,7 @@ def _load_credentials(token_json: Optional[str]) -> Optional[Credentials]:
             except Exception as e:
                 # Most common case is invalid_grant (revoked/expired refresh token).
                 # Return None so caller can treat as "not armed" instead of hard crash.
-                print(f"Gmail trigger: token refresh failed: {str(e)}")
+                logger.error("Gmail trigger: token refresh failed: %s", e)
                 return None
         else:
             return None
@@ -59,7 +62,7 @@ async def fetch_latest_email_event(
     """Fetch latest Gmail message metadata that matches node filters."""
     creds = _load_credentials(token_json)
     if not creds:
-        print("Gmail trigger: credentials unavailable")
+        logger.warning("Gmail trigger: credentials unavailable")
         return None
 
     try:
@@ -108,7 +111,7 @@ async def fetch_latest_email_event(
             "label": label,
         }
     except Exception as e:
-        print(f"Gmail trigger: fetch failed: {str(e)}")
+        logger.error("Gmail trigger: fetch failed: %s", e)
         return None
 
 
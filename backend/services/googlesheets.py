@@ -1,8 +1,11 @@
 from __future__ import print_function
+import logging
 import os
 import json
 from typing import List, Any, Optional
 
+logger = logging.getLogger(__name__)
+
 # Try to import Google Sheets dependencies
 try:
     from googleapiclient.discovery import build
@@ -44,30 +47,30 @@ def write_to_sheet(
         TOKEN_FILE = os.path.join(backend_root, "sheets_token.json")
         CREDENTIALS_FILE = os.path.join(backend_root, "credentials.json")
         
-        print(f"📊 Writing to Google Sheet: {spreadsheet_id}")
-        print(f"📋 Range: {range_name}")
-        print(f"📝 Data rows: {len(values)}")
+        logger.debug("📊 Writing to Google Sheet: %s", spreadsheet_id)
+        logger.debug("📋 Range: %s", range_name)
+        logger.debug("📝 Data rows: %s", len(values))
         
         creds = None
         if token_json:
             try:
                 token_data = json.loads(token_json) if isinstance(token_json, str) else token_json
                 creds = Credentials.from_authorized_user_info(token_data, SCOPES)
-                print("Loaded user Google token from API keys")
+                logger.debug("Loaded user Google token from API keys")
             except Exception as e:
                 return f"Error: Invalid user Google token JSON: {str(e)}"
         elif os.path.exists(TOKEN_FILE):
-            print("Loading existing Sheets token...")
+            logger.debug("Loading existing Sheets token...")
             creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
         
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
-                print("Refreshing expired token...")
+                logger.debug("Refreshing expired token...")
                 try:
                     creds.refresh(Request())
-                    print("Token refreshed successfully")
+                    logger.debug("Token refreshed successfully")
                 except Exception as e:
-                    print(f"Token refresh failed: {e}")
+                    logger.warning("Token refresh failed: %s", e)
                     if not token_json and os.path.exists(TOKEN_FILE):
                         os.remove(TOKEN_FILE)
                     creds = None
@@ -76,20 +79,20 @@ def write_to_sheet(
                 if token_json or not _allow_server_fallback():
                     return "Error: Missing/invalid user Google token. Add google_token_json in Settings > API Keys."
 
-                print("Starting new OAuth flow...")
+                logger.debug("Starting new OAuth flow...")
                 if not os.path.exists(CREDENTIALS_FILE):
                     return "Error: credentials.json file not found. Please download it from Google Cloud Console and ensure Google Sheets API is enabled."
                 
                 flow = InstalledAppFlow.from_client_secrets_file(CREDENTIALS_FILE, SCOPES)
                 creds = flow.run_local_server(port=0)
-                print("OAuth flow completed successfully")
+                logger.debug("OAuth flow completed successfully")
             
             if not token_json:
                 with open(TOKEN_FILE, 'w') as token:
                     token.write(creds.to_json())
-                    print("Token saved successfully")
+                    logger.debug("Token saved successfully")
         
-        print("Building Sheets service...")
+        logger.debug("Building Sheets service...")
         service = build('sheets', 'v4', credentials=creds)
         
         # Prepare the request body
@@ -97,7 +100,7 @@ def write_to_sheet(
             'values': values
         }
         
-        print("Writing data to sheet...")
+        logger.debug("Writing data to sheet...")
         result = service.spreadsheets().values().update(
             spreadsheetId=spreadsheet_id,
             range=range_name,
@@ -106,13 +109,13 @@ def write_to_sheet(
         ).execute()
         
         updated_cells = result.get('updatedCells', 0)
-        print(f"✅ Successfully updated {updated_cells} cells in Google Sheets")
+        logger.info("✅ Successfully updated %s cells in Google Sheets", updated_cells)
         
         return f"Google Sheets updated successfully. {updated_cells} cells updated."
         
     except Exception as e:
         error_msg = f"Google Sheets write failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
 async def run_google_sheets_node(node_data):
@@ -142,5 +145,5 @@ async def run_google_sheets_node(node_data):
         
     except Exception as e:
         error_msg = f"Google Sheets node error: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
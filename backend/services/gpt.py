@@ -1,9 +1,13 @@
 # services/gpt.py
 
+import logging
 from dotenv import load_dotenv
 import os
 import httpx
 import asyncio
+from typing import Optional
+
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
@@ -26,6 +30,30 @@ GROQ_MODEL_MAP = {
 
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 
+# Shared client so keep-alive connections to Groq survive between calls.
+# httpx clients are bound to the loop they were first used on.
+_http_client: Optional[httpx.AsyncClient] = None
+_http_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it for the running loop if needed."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(timeout=60.0)
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HTTP client"""
+    global _http_client, _http_client_loop
+    if _http_client is not None and not _http_client.is_closed:
+        await _http_client.aclose()
+    _http_client = None
+    _http_client_loop = None
+
 
 def _resolve_groq_model(model: str) -> str:
     """Resolve a node model name to a Groq model ID."""
@@ -47,17 +75,23 @@ def _resolve_groq_model(model: str) -> str:
     return "llama-3.3-70b-versatile"
 
 
-async def run_gpt_node(prompt: str, model: str = "llama-3.3-70b-versatile") -> str:
-    """Run AI node using Groq API"""
+async def run_gpt_node(
+    prompt: str,
+    model: str = "llama-3.3-70b-versatile",
+    max_tokens: int = 1000,
+    *,
+    api_key: Optional[str] = None,
+) -> str:
+    """Run AI node using Groq API (api_key defaults to GROQ_API_KEY)"""
     try:
-        api_key = os.getenv("GROQ_API_KEY")
+        api_key = api_key or os.getenv("GROQ_API_KEY")
 
         if not api_key:
             return "Error: Groq API key not configured"
 
         actual_model = _resolve_groq_model(model)
 
-        print(f"🤖 Running {actual_model} via Groq with prompt: {prompt[:100]}...")
+        logger.debug("🤖 Running %s via Groq with prompt: %s...", actual_model, prompt[:100])
 
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -72,34 +106,33 @@ async def run_gpt_node(prompt: str, model: str = "llama-3.3-70b-versatile") -> s
                     "content": prompt
                 }
             ],
-            "max_tokens": 1000,
+            "max_tokens": max_tokens,
             "temperature": 0.7
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                GROQ_API_URL,
-                headers=headers,
-                json=payload
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-
-                if "choices" in result and len(result["choices"]) > 0:
-                    content = result["choices"][0]["message"]["content"]
-                    print(f"✅ {actual_model} response: {content[:100]}...")
-                    return content
-                else:
-                    return f"Error: No response from {actual_model}"
+        response = await _get_http_client().post(
+            GROQ_API_URL,
+            headers=headers,
+            json=payload
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+
+            if "choices" in result and len(result["choices"]) > 0:
+                content = result["choices"][0]["message"]["content"]
+                logger.info("✅ %s response: %s...", actual_model, content[:100])
+                return content
             else:
-                error_text = response.text
-                print(f"❌ Groq API Error ({response.status_code}): {error_text}")
-                return f"Error: API request failed ({response.status_code}): {error_text}"
+                return f"Error: No response from {actual_model}"
+        else:
+            error_text = response.text
+            logger.error("❌ Groq API Error (%s): %s", response.status_code, error_text)
+            return f"Error: API request failed ({response.status_code}): {error_text}"
 
     except asyncio.TimeoutError:
         return f"Error: Request timeout for {model}"
     except Exception as e:
         error_msg = f"Error running {model}: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
@@ -0,0 +1,43 @@
+# services/http_session.py
+
+import asyncio
+import logging
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Shared aiohttp session for the services that call out to webhooks and HTTP APIs,
+# so keep-alive connections (and their TLS sessions) are reused across nodes.
+# Like the httpx client in services.gpt, it is bound to the loop it was created on.
+# It serves every user's workflows, so it must never store cookies: a cookie set
+# by one user's target would otherwise be sent with other users' requests.
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+CONNECTION_LIMIT = 100
+KEEPALIVE_TIMEOUT = 60
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it for the running loop if needed.
+
+    Callers pass their own ``timeout=`` per request; the session has none.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT, keepalive_timeout=KEEPALIVE_TIMEOUT)
+        _session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+        _session_loop = loop
+    return _session
+
+
+async def close_http_session():
+    """Close the shared session"""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
@@ -1,9 +1,12 @@
+import logging
 import os
 import uuid
 import base64
 import httpx
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
 
 # File directories - Use /tmp for cloud deployment compatibility
 BASE_DIR = "/tmp"
@@ -12,14 +15,16 @@ IMAGES_DIR = os.path.join(BASE_DIR, "generated_images")
 # Create directory if it doesn't exist
 os.makedirs(IMAGES_DIR, exist_ok=True)
 
-async def generate_openai_image(prompt: str, size: str = "1024x1024", quality: str = "standard") -> str:
+async def generate_openai_image(
+    prompt: str, size: str = "1024x1024", quality: str = "standard", api_key: Optional[str] = None
+) -> str:
     """Generate image using OpenAI DALL-E"""
     try:
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             return "Error: OpenAI API key not configured"
         
-        print(f"🎨 Generating OpenAI image with prompt: {prompt[:100]}...")
+        logger.debug("🎨 Generating OpenAI image with prompt: %s...", prompt[:100])
         
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -56,7 +61,7 @@ async def generate_openai_image(prompt: str, size: str = "1024x1024", quality: s
                         with open(file_path, "wb") as f:
                             f.write(image_response.content)
                         
-                        print(f"✅ OpenAI image saved: {file_path}")
+                        logger.info("✅ OpenAI image saved: %s", file_path)
                         return file_path
                     else:
                         return "Error: Failed to download generated image"
@@ -64,24 +69,26 @@ async def generate_openai_image(prompt: str, size: str = "1024x1024", quality: s
                     return "Error: No image data in OpenAI response"
             else:
                 error_text = response.text
-                print(f"❌ OpenAI API Error ({response.status_code}): {error_text}")
+                logger.error("❌ OpenAI API Error (%s): %s", response.status_code, error_text)
                 return f"Error: OpenAI API request failed ({response.status_code})"
                 
     except asyncio.TimeoutError:
         return "Error: OpenAI image generation timeout"
     except Exception as e:
         error_msg = f"Error generating OpenAI image: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
-async def generate_stability_image(prompt: str, width: int = 1024, height: int = 1024) -> str:
+async def generate_stability_image(
+    prompt: str, width: int = 1024, height: int = 1024, api_key: Optional[str] = None
+) -> str:
     """Generate image using Stability AI"""
     try:
-        api_key = os.getenv("STABILITY_API_KEY")
+        api_key = api_key or os.getenv("STABILITY_API_KEY")
         if not api_key:
             return "Error: Stability AI API key not configured"
         
-        print(f"🎨 Generating Stability AI image with prompt: {prompt[:100]}...")
+        logger.debug("🎨 Generating Stability AI image with prompt: %s...", prompt[:100])
         
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -124,20 +131,20 @@ async def generate_stability_image(prompt: str, width: int = 1024, height: int =
                     with open(file_path, "wb") as f:
                         f.write(image_bytes)
                     
-                    print(f"✅ Stability AI image saved: {file_path}")
+                    logger.info("✅ Stability AI image saved: %s", file_path)
                     return file_path
                 else:
                     return "Error: No image data in Stability AI response"
             else:
                 error_text = response.text
-                print(f"❌ Stability AI API Error ({response.status_code}): {error_text}")
+                logger.error("❌ Stability AI API Error (%s): %s", response.status_code, error_text)
                 return f"Error: Stability AI API request failed ({response.status_code})"
                 
     except asyncio.TimeoutError:
         return "Error: Stability AI image generation timeout"
     except Exception as e:
         error_msg = f"Error generating Stability AI image: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
 
@@ -169,7 +176,7 @@ async def generate_huggingface_image(prompt: str, size: str = "1024x1024") -> st
         else:
             width = height = 1024
 
-        print(f"🎨 Generating Hugging Face image with prompt: {prompt[:100]}...")
+        logger.debug("🎨 Generating Hugging Face image with prompt: %s...", prompt[:100])
 
         headers = {
             "Authorization": f"Bearer {api_key}",
@@ -190,7 +197,7 @@ async def generate_huggingface_image(prompt: str, size: str = "1024x1024") -> st
             last_error = ""
             for model_id in models_to_try:
                 endpoint = f"https://router.huggingface.co/hf-inference/models/{model_id}"
-                print(f"   Model: {model_id}")
+                logger.debug("   Model: %s", model_id)
 
                 response = await client.post(endpoint, headers=headers, json=payload)
 
@@ -207,19 +214,19 @@ async def generate_huggingface_image(prompt: str, size: str = "1024x1024") -> st
                     with open(file_path, "wb") as f:
                         f.write(response.content)
 
-                    print(f"✅ Hugging Face image saved: {file_path}")
+                    logger.info("✅ Hugging Face image saved: %s", file_path)
                     return file_path
 
                 # Model deprecated on current provider - try fallback model.
                 if response.status_code == 410:
-                    print(f"⚠️ Hugging Face model deprecated on hf-inference: {model_id}. Trying fallback...")
+                    logger.warning("⚠️ Hugging Face model deprecated on hf-inference: %s. Trying fallback...", model_id)
                     last_status = response.status_code
                     last_error = response.text
                     continue
 
                 # If model is not available/loading, continue through fallbacks.
                 if response.status_code in {404, 503}:
-                    print(f"⚠️ Hugging Face model unavailable: {model_id} ({response.status_code}). Trying fallback...")
+                    logger.warning("⚠️ Hugging Face model unavailable: %s (%s). Trying fallback...", model_id, response.status_code)
                     last_status = response.status_code
                     last_error = response.text
                     continue
@@ -232,18 +239,18 @@ async def generate_huggingface_image(prompt: str, size: str = "1024x1024") -> st
             if last_status == 410:
                 return "Error: Hugging Face model is deprecated on hf-inference. Set HF_IMAGE_MODEL to a supported model."
 
-            print(f"❌ Hugging Face API Error ({last_status}): {last_error}")
+            logger.error("❌ Hugging Face API Error (%s): %s", last_status, last_error)
             return f"Error: Hugging Face API request failed ({last_status})"
 
     except asyncio.TimeoutError:
         return "Error: Hugging Face image generation timeout"
     except Exception as e:
         error_msg = f"Error generating Hugging Face image: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
-async def run_image_generation_node(node_data: Dict[str, Any]) -> str:
-    """Main function for image generation node"""
+async def run_image_generation_node(node_data: Dict[str, Any], api_key: Optional[str] = None) -> str:
+    """Main function for image generation node (api_key overrides the provider's env key)"""
     try:
         prompt = node_data.get("prompt", "")
         provider = node_data.get("provider", "openai")
@@ -253,20 +260,20 @@ async def run_image_generation_node(node_data: Dict[str, Any]) -> str:
         if not prompt:
             return "Error: Image prompt is required"
         
-        print(f"🎨 Image generation request:")
-        print(f"   Provider: {provider}")
-        print(f"   Prompt: {prompt[:100]}...")
-        print(f"   Size: {size}")
+        logger.debug("🎨 Image generation request:")
+        logger.debug("   Provider: %s", provider)
+        logger.debug("   Prompt: %s...", prompt[:100])
+        logger.debug("   Size: %s", size)
         
         if provider == "openai":
-            result = await generate_openai_image(prompt, size, quality)
+            result = await generate_openai_image(prompt, size, quality, api_key=api_key)
         elif provider == "stability":
             # Parse size for Stability AI
             if "x" in size:
                 width, height = map(int, size.split("x"))
             else:
                 width = height = 1024
-            result = await generate_stability_image(prompt, width, height)
+            result = await generate_stability_image(prompt, width, height, api_key=api_key)
         elif provider in {"huggingface", "hf"}:
             result = await generate_huggingface_image(prompt, size)
         else:
@@ -278,10 +285,10 @@ async def run_image_generation_node(node_data: Dict[str, Any]) -> str:
         else:
             # Return success message with file path
             file_size = os.path.getsize(result) / 1024  # Size in KB
-            print(f"📁 Generated image: {os.path.basename(result)} ({file_size:.1f} KB)")
+            logger.debug("📁 Generated image: %s (%.1f KB)", os.path.basename(result), file_size)
             return f"Image generated: {result}"
             
     except Exception as e:
         error_msg = f"Image generation failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
@@ -1,3 +1,4 @@
+import logging
 import os
 import uuid
 import json
@@ -5,6 +6,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List
 import re
 
+logger = logging.getLogger(__name__)
+
 # PDF generation
 try:
     from reportlab.lib.pagesizes import A4, letter
@@ -662,8 +665,8 @@ async def run_report_generator_node(node_data: Dict[str, Any]) -> str:
         content = node_data.get("content", "# AutoFlow Report\n\nThis comprehensive report was generated automatically.")
         format_type = node_data.get("format", "pdf").lower()
         
-        print(f"📊 Generating enhanced {format_type.upper()} report: {title}")
-        print(f"📄 Content length: {len(content)} characters")
+        logger.debug("📊 Generating enhanced %s report: %s", format_type.upper(), title)
+        logger.debug("📄 Content length: %s characters", len(content))
         
         # Extract and enhance report data
         report_data = node_data.get("data", {})
@@ -705,14 +708,14 @@ async def run_report_generator_node(node_data: Dict[str, Any]) -> str:
             return f"Error: Unsupported format '{format_type}'. Use 'pdf' or 'docx'"
         
         file_size = os.path.getsize(file_path) / 1024  # Size in KB
-        print(f"✅ Enhanced report generated successfully!")
-        print(f"📁 File: {os.path.basename(file_path)} ({file_size:.1f} KB)")
-        print(f"📂 Location: {file_path}")
+        logger.info("✅ Enhanced report generated successfully!")
+        logger.debug("📁 File: %s (%.1f KB)", os.path.basename(file_path), file_size)
+        logger.debug("📂 Location: %s", file_path)
         
         return f"Report generated: {file_path}"
         
     except ImportError as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        print(f"❌ Report generation error: {str(e)}")
+        logger.error("❌ Report generation error: %s", e)
         return f"Report generation failed: {str(e)}"
@@ -5,16 +5,21 @@ from apscheduler.triggers.date import DateTrigger
 from datetime import datetime, timedelta
 import asyncio
 from typing import Dict, Any, List
-from backend.app.core.runner import run_workflow_engine  
 
-# Global scheduler instance
+# Global scheduler instance; its worker thread is only started once a workflow
+# is actually scheduled, so importing this module costs nothing
 scheduler = BackgroundScheduler()
-scheduler.start()
+
+
+def _ensure_started() -> None:
+    if not scheduler.running:
+        scheduler.start()
 
 def schedule_workflow(workflow_id: str, trigger_type: str, trigger_config: Dict[str, Any], workflow_executor) -> str:
     """Schedule a workflow with different trigger types"""
     try:
         print(f"📅 Scheduling workflow {workflow_id} with {trigger_type} trigger")
+        _ensure_started()
         
         # Remove existing job if it exists
         try:
@@ -159,7 +164,8 @@ def get_common_schedules() -> Dict[str, str]:
 def shutdown_scheduler():
     """Shutdown the scheduler"""
     try:
-        scheduler.shutdown()
+        if scheduler.running:
+            scheduler.shutdown()
         print("📅 Scheduler shutdown successfully")
     except Exception as e:
         print(f"❌ Error shutting down scheduler: {str(e)}")
@@ -1,3 +1,4 @@
+import logging
 import os
 import aiohttp
 import asyncio
@@ -5,6 +6,10 @@ import json
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from services.http_session import get_http_session
+
+logger = logging.getLogger(__name__)
+
 # Twitter API dependencies
 try:
     import tweepy
@@ -44,15 +49,15 @@ class SocialMediaPoster:
                             access_token=access_token,
                             access_token_secret=access_token_secret
                         )
-                        print("✅ Twitter client initialized")
+                        logger.info("✅ Twitter client initialized")
                     except Exception as e:
-                        print(f"⚠️ Twitter client setup failed: {str(e)}")
+                        logger.warning("⚠️ Twitter client setup failed: %s", e)
                 else:
-                    print("⚠️ Twitter credentials not found in environment")
+                    logger.warning("⚠️ Twitter credentials not found in environment")
             else:
-                print("⚠️ Tweepy not available. Install with: pip install tweepy")
+                logger.warning("⚠️ Tweepy not available. Install with: pip install tweepy")
         except Exception as e:
-            print(f"❌ Error setting up social media clients: {str(e)}")
+            logger.error("❌ Error setting up social media clients: %s", e)
     
     async def post_to_twitter(self, content: str, image_path: Optional[str] = None) -> Dict[str, Any]:
         """Post to Twitter/X"""
@@ -85,7 +90,7 @@ class SocialMediaPoster:
                             text=content,
                             media_ids=[media.media_id]
                         )
-                        print(f"📱 Posted to Twitter with image: {response.data['id']}")
+                        logger.debug("📱 Posted to Twitter with image: %s", response.data['id'])
                         return {
                             "success": True,
                             "platform": "twitter",
@@ -95,10 +100,10 @@ class SocialMediaPoster:
                             "has_media": True
                         }
                     except Exception as e:
-                        print(f"⚠️ Twitter media upload failed: {str(e)}")
+                        logger.warning("⚠️ Twitter media upload failed: %s", e)
                         # Fall back to text-only post
                         response = self.twitter_client.create_tweet(text=content)
-                        print(f"📱 Posted to Twitter (text only): {response.data['id']}")
+                        logger.debug("📱 Posted to Twitter (text only): %s", response.data['id'])
                         return {
                             "success": True,
                             "platform": "twitter",
@@ -111,7 +116,7 @@ class SocialMediaPoster:
                 else:
                     # Text-only post
                     response = self.twitter_client.create_tweet(text=content)
-                    print(f"📱 Posted to Twitter: {response.data['id']}")
+                    logger.debug("📱 Posted to Twitter: %s", response.data['id'])
                     return {
                         "success": True,
                         "platform": "twitter",
@@ -123,7 +128,7 @@ class SocialMediaPoster:
             else:
                 # Text-only post
                 response = self.twitter_client.create_tweet(text=content)
-                print(f"📱 Posted to Twitter: {response.data['id']}")
+                logger.debug("📱 Posted to Twitter: %s", response.data['id'])
                 return {
                     "success": True,
                     "platform": "twitter",
@@ -135,15 +140,15 @@ class SocialMediaPoster:
                 
         except tweepy.Forbidden as e:
             error_msg = f"Twitter API access forbidden: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
         except tweepy.TooManyRequests as e:
             error_msg = f"Twitter API rate limit exceeded: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
         except Exception as e:
             error_msg = f"Twitter posting failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
     
     async def post_to_linkedin(self, content: str, image_path: Optional[str] = None) -> Dict[str, Any]:
@@ -181,7 +186,7 @@ class SocialMediaPoster:
             
             # Note: This is a placeholder implementation
             # Full LinkedIn integration requires proper OAuth setup
-            print(f"📱 LinkedIn posting prepared (credentials needed for actual posting)")
+            logger.debug("📱 LinkedIn posting prepared (credentials needed for actual posting)")
             return {
                 "success": False,
                 "error": "LinkedIn posting requires full OAuth setup",
@@ -192,7 +197,7 @@ class SocialMediaPoster:
             
         except Exception as e:
             error_msg = f"LinkedIn posting failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
     
     async def post_to_instagram(self, content: str, image_path: Optional[str] = None) -> Dict[str, Any]:
@@ -209,7 +214,7 @@ class SocialMediaPoster:
             
             # Note: This is a placeholder implementation
             # Full Instagram integration requires Instagram Basic Display API or Instagram Graph API
-            print(f"📱 Instagram posting prepared (Business API needed for actual posting)")
+            logger.debug("📱 Instagram posting prepared (Business API needed for actual posting)")
             return {
                 "success": False,
                 "error": "Instagram posting requires Instagram Business API setup",
@@ -220,7 +225,7 @@ class SocialMediaPoster:
             
         except Exception as e:
             error_msg = f"Instagram posting failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
     
     async def post_via_webhook(self, webhook_url: str, content: str, platform: str, image_path: Optional[str] = None) -> Dict[str, Any]:
@@ -245,35 +250,35 @@ class SocialMediaPoster:
                             "mime_type": "image/png"
                         }
                 except Exception as e:
-                    print(f"⚠️ Could not encode image for webhook: {str(e)}")
+                    logger.warning("⚠️ Could not encode image for webhook: %s", e)
             
             timeout = aiohttp.ClientTimeout(total=30)
             
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    
-                    if response.status == 200:
-                        response_data = await response.text()
-                        print(f"📱 Posted via webhook to {platform}")
-                        return {
-                            "success": True,
-                            "platform": platform,
-                            "method": "webhook",
-                            "webhook_url": webhook_url,
-                            "content": content,
-                            "response": response_data[:200] if response_data else "Success"
-                        }
-                    else:
-                        error_msg = f"Webhook returned status {response.status}"
-                        return {"success": False, "error": error_msg}
+            async with get_http_session().post(
+                webhook_url,
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                timeout=timeout
+            ) as response:
+                
+                if response.status == 200:
+                    response_data = await response.text()
+                    logger.debug("📱 Posted via webhook to %s", platform)
+                    return {
+                        "success": True,
+                        "platform": platform,
+                        "method": "webhook",
+                        "webhook_url": webhook_url,
+                        "content": content,
+                        "response": response_data[:200] if response_data else "Success"
+                    }
+                else:
+                    error_msg = f"Webhook returned status {response.status}"
+                    return {"success": False, "error": error_msg}
                         
         except Exception as e:
             error_msg = f"Webhook posting failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             return {"success": False, "error": error_msg}
 
 async def run_social_media_node(node_data: Dict[str, Any]) -> str:
@@ -287,14 +292,14 @@ async def run_social_media_node(node_data: Dict[str, Any]) -> str:
         if not content.strip():
             return "Error: Social media content is required"
         
-        print(f"📱 Posting to {platform}: {content[:50]}...")
+        logger.debug("📱 Posting to %s: %s...", platform, content[:50])
         
         # Initialize poster
         poster = SocialMediaPoster()
         
         # Validate image path if provided
         if image_path and not os.path.exists(image_path):
-            print(f"⚠️ Image file not found: {image_path}")
+            logger.warning("⚠️ Image file not found: %s", image_path)
             image_path = None
         
         # Route to appropriate platform
@@ -325,16 +330,16 @@ async def run_social_media_node(node_data: Dict[str, Any]) -> str:
             if result.get("note"):
                 success_msg += f" - Note: {result['note']}"
             
-            print(f"✅ {success_msg}")
+            logger.info("✅ %s", success_msg)
             return success_msg
         else:
             error_msg = result.get("error", "Unknown error") if result else "Posting failed"
-            print(f"❌ Social media posting failed: {error_msg}")
+            logger.error("❌ Social media posting failed: %s", error_msg)
             return f"Social media posting failed: {error_msg}"
             
     except Exception as e:
         error_msg = f"Social media node execution failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
 # Helper function to check social media credentials
@@ -1,3 +1,4 @@
+import logging
 import aiohttp
 import asyncio
 import json
@@ -5,6 +6,10 @@ import os
 from typing import Dict, Any, Optional
 from datetime import datetime
 
+from services.http_session import get_http_session
+
+logger = logging.getLogger(__name__)
+
 async def run_webhook_node(webhook_data: Dict[str, Any]) -> str:
     """Execute webhook request with enhanced error handling and validation"""
     try:
@@ -20,7 +25,7 @@ async def run_webhook_node(webhook_data: Dict[str, Any]) -> str:
         # Enhanced validation
         if not webhook_url:
             # For local/test workflows, just return a dummy result so the workflow continues
-            print("⚠️ Webhook node triggered (no URL provided), returning dummy result.")
+            logger.warning("⚠️ Webhook node triggered (no URL provided), returning dummy result.")
             return "Webhook triggered (no URL provided)"
         
         # Validate URL format
@@ -37,8 +42,8 @@ async def run_webhook_node(webhook_data: Dict[str, Any]) -> str:
             try:
                 webhook_payload = json.loads(body)
             except json.JSONDecodeError as e:
-                print(f"⚠️ Invalid JSON in webhook body: {body[:100]}...")
-                print(f"⚠️ JSON Error: {str(e)}")
+                logger.warning("⚠️ Invalid JSON in webhook body: %s...", body[:100])
+                logger.warning("⚠️ JSON Error: %s", e)
                 # Use body as plain text data instead of failing
                 webhook_payload = {"data": body}
         
@@ -57,126 +62,130 @@ async def run_webhook_node(webhook_data: Dict[str, Any]) -> str:
             else:
                 request_headers["Authorization"] = f"Bearer {auth_token}"
         
-        print(f"🔗 Webhook Details:")
-        print(f"   Method: {method}")
-        print(f"   URL: {webhook_url}")
-        print(f"   Timeout: {timeout}s")
-        print(f"   Headers: {len(request_headers)} custom headers")
-        print(f"   Payload size: {len(str(webhook_payload))} characters")
-        if description:
-            print(f"   Description: {description}")
+        # Sizing the payload stringifies it, so only do that when it will be logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "🔗 Webhook Details: method=%s url=%s timeout=%ss headers=%d payload=%d chars%s",
+                method, webhook_url, timeout, len(request_headers), len(str(webhook_payload)),
+                f" ({description})" if description else "",
+            )
         
-        # Use aiohttp for async requests with proper timeout and error handling
+        # Use the shared aiohttp session with a per-request timeout
         timeout_config = aiohttp.ClientTimeout(total=timeout)
+        session = get_http_session()
         
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            try:
-                if method == "GET":
-                    # For GET requests, add payload as query parameters if provided
-                    params = webhook_payload if isinstance(webhook_payload, dict) else None
-                    async with session.get(webhook_url, headers=request_headers, params=params) as response:
-                        status = response.status
-                        response_text = await response.text()
-                        response_headers = dict(response.headers)
-                        
-                elif method in ["POST", "PUT", "PATCH"]:
-                    async with session.request(
-                        method, 
-                        webhook_url, 
-                        json=webhook_payload,
-                        headers=request_headers
-                    ) as response:
-                        status = response.status
-                        response_text = await response.text()
-                        response_headers = dict(response.headers)
-                        
-                elif method == "DELETE":
-                    async with session.delete(webhook_url, headers=request_headers) as response:
-                        status = response.status
-                        response_text = await response.text()
-                        response_headers = dict(response.headers)
-                        
-                elif method == "HEAD":
-                    async with session.head(webhook_url, headers=request_headers) as response:
-                        status = response.status
-                        response_text = ""  # HEAD responses don't have body
-                        response_headers = dict(response.headers)
-                        
-                elif method == "OPTIONS":
-                    async with session.options(webhook_url, headers=request_headers) as response:
-                        status = response.status
-                        response_text = await response.text()
-                        response_headers = dict(response.headers)
-                        
-                else:
-                    return f"Error: Unsupported HTTP method {method}"
-                
-                # Enhanced response handling
-                print(f"✅ Webhook response received:")
-                print(f"   Status: {status}")
-                print(f"   Response size: {len(response_text)} characters")
-                print(f"   Content-Type: {response_headers.get('content-type', 'Unknown')}")
-                
-                # Determine success based on status code
-                if 200 <= status < 300:
-                    success_msg = f"Webhook {description or 'request'} executed successfully"
-                    
-                    # Include response data if available and not too large
-                    if response_text and len(response_text) < 500:
-                        try:
-                            # Try to parse JSON response
-                            response_json = json.loads(response_text)
-                            success_msg += f" | Response: {response_json}"
-                        except json.JSONDecodeError:
-                            # Use plain text response
-                            success_msg += f" | Response: {response_text[:200]}..."
+        try:
+            if method == "GET":
+                # For GET requests, add payload as query parameters if provided
+                params = webhook_payload if isinstance(webhook_payload, dict) else None
+                async with session.get(webhook_url, headers=request_headers, params=params,
+                                       timeout=timeout_config) as response:
+                    status = response.status
+                    response_text = await response.text()
+                    response_headers = dict(response.headers)
                     
-                    success_msg += f" | Status: {status}"
-                    return success_msg
+            elif method in ["POST", "PUT", "PATCH"]:
+                async with session.request(
+                    method, 
+                    webhook_url, 
+                    json=webhook_payload,
+                    headers=request_headers,
+                    timeout=timeout_config
+                ) as response:
+                    status = response.status
+                    response_text = await response.text()
+                    response_headers = dict(response.headers)
                     
-                elif 400 <= status < 500:
-                    error_msg = f"Webhook client error: {status}"
-                    if response_text:
-                        error_msg += f" | {response_text[:200]}"
-                    return error_msg
+            elif method == "DELETE":
+                async with session.delete(webhook_url, headers=request_headers,
+                                          timeout=timeout_config) as response:
+                    status = response.status
+                    response_text = await response.text()
+                    response_headers = dict(response.headers)
                     
-                elif 500 <= status < 600:
-                    error_msg = f"Webhook server error: {status}"
-                    if response_text:
-                        error_msg += f" | {response_text[:200]}"
-                    return error_msg
+            elif method == "HEAD":
+                async with session.head(webhook_url, headers=request_headers,
+                                        timeout=timeout_config) as response:
+                    status = response.status
+                    response_text = ""  # HEAD responses don't have body
+                    response_headers = dict(response.headers)
                     
-                else:
-                    return f"Webhook request completed with status: {status}"
+            elif method == "OPTIONS":
+                async with session.options(webhook_url, headers=request_headers,
+                                           timeout=timeout_config) as response:
+                    status = response.status
+                    response_text = await response.text()
+                    response_headers = dict(response.headers)
                     
-            except aiohttp.ClientResponseError as e:
-                error_msg = f"Webhook HTTP error: {e.status} - {e.message}"
-                print(f"❌ {error_msg}")
+            else:
+                return f"Error: Unsupported HTTP method {method}"
+            
+            # Enhanced response handling
+            logger.info("✅ Webhook response received:")
+            logger.debug("   Status: %s", status)
+            logger.debug("   Response size: %s characters", len(response_text))
+            logger.debug("   Content-Type: %s", response_headers.get('content-type', 'Unknown'))
+            
+            # Determine success based on status code
+            if 200 <= status < 300:
+                success_msg = f"Webhook {description or 'request'} executed successfully"
+                
+                # Include response data if available and not too large
+                if response_text and len(response_text) < 500:
+                    try:
+                        # Try to parse JSON response
+                        response_json = json.loads(response_text)
+                        success_msg += f" | Response: {response_json}"
+                    except json.JSONDecodeError:
+                        # Use plain text response
+                        success_msg += f" | Response: {response_text[:200]}..."
+                
+                success_msg += f" | Status: {status}"
+                return success_msg
+                
+            elif 400 <= status < 500:
+                error_msg = f"Webhook client error: {status}"
+                if response_text:
+                    error_msg += f" | {response_text[:200]}"
                 return error_msg
                 
-            except aiohttp.ClientConnectorError as e:
-                error_msg = f"Webhook connection error: Unable to connect to {webhook_url}"
-                print(f"❌ {error_msg}")
+            elif 500 <= status < 600:
+                error_msg = f"Webhook server error: {status}"
+                if response_text:
+                    error_msg += f" | {response_text[:200]}"
                 return error_msg
+                
+            else:
+                return f"Webhook request completed with status: {status}"
+                
+        except aiohttp.ClientResponseError as e:
+            error_msg = f"Webhook HTTP error: {e.status} - {e.message}"
+            logger.error("❌ %s", error_msg)
+            return error_msg
+            
+        except aiohttp.ClientConnectorError as e:
+            error_msg = f"Webhook connection error: Unable to connect to {webhook_url}"
+            logger.error("❌ %s", error_msg)
+            return error_msg
 
     except asyncio.TimeoutError:
         error_msg = f"Webhook request timed out after {timeout} seconds"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
         
     except aiohttp.ClientError as e:
         error_msg = f"Webhook client error: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
         
     except json.JSONDecodeError as e:
         error_msg = f"Webhook JSON error: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
         
     except Exception as e:
         error_msg = f"Webhook failed: {str(e)}"
-        print(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         return error_msg
 
 async def validate_webhook_url(url: str) -> Dict[str, Any]:
@@ -187,14 +196,13 @@ async def validate_webhook_url(url: str) -> Dict[str, Any]:
         
         timeout_config = aiohttp.ClientTimeout(total=10)
         
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            async with session.head(url) as response:
-                return {
-                    "valid": True,
-                    "status": response.status,
-                    "headers": dict(response.headers),
-                    "message": "URL is reachable"
-                }
+        async with get_http_session().head(url, timeout=timeout_config) as response:
+            return {
+                "valid": True,
+                "status": response.status,
+                "headers": dict(response.headers),
+                "message": "URL is reachable"
+            }
                 
     except asyncio.TimeoutError:
         return {"valid": False, "error": "URL validation timeout"}
@@ -218,7 +226,7 @@ async def test_webhook_node(webhook_url: str) -> Dict[str, Any]:
         "timeout": 10
     }
     
-    print(f"🧪 Testing webhook: {webhook_url}")
+    logger.debug("🧪 Testing webhook: %s", webhook_url)
     result = await run_webhook_node(test_data)
     
     return {